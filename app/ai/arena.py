@@ -0,0 +1,269 @@
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import torch
+
+from app.ai.evaluation import is_in_check
+from app.ai.prediction import rank_moves
+from app.ai.utils import PLANES, board_to_matrix
+from app.chess.bitboard import KING, KNIGHT, BISHOP, move_to_uci
+from app.chess.engine import ChessEngine
+from app.core.config import settings
+
+RESULT_SCORES = {'1-0': 1.0, '0-1': 0.0, '1/2-1/2': 0.5}
+
+_models = {}
+
+
+def _init_worker():
+    torch.set_num_threads(1)
+
+
+def player_spec(spec: str) -> str:
+    """argparse type for a player: ``policy``, ``policy:<checkpoint>``, ``search[:<nodes>]`` or ``random``."""
+    name, _, argument = spec.partition(':')
+    if spec in ('policy', 'search', 'random'):
+        return spec
+    if name == 'policy' and argument:
+        if not os.path.isfile(argument):
+            raise argparse.ArgumentTypeError(f"no checkpoint at {argument!r}")
+        return spec
+    if name == 'search' and argument.isdigit() and int(argument) > 0:
+        return spec
+    raise argparse.ArgumentTypeError(f"unknown player {spec!r}: expected policy, policy:<checkpoint>, "
+                                     f"search[:<nodes>] or random")
+
+
+def player_model(spec: str):
+    """``policy`` is the configured model, ``policy:<path>`` another checkpoint with the same vocabulary."""
+    if spec not in _models:
+        if spec == 'policy':
+            _models[spec] = settings.MODEL
+        elif not spec.startswith('policy:'):
+            raise ValueError(f"unknown player {spec!r}")
+        else:
+            from app.core.model import load_checkpoint
+
+            _models[spec] = load_checkpoint(spec.split(':', 1)[1], len(settings.VOCABULARY))
+    return _models[spec]
+
+
+class Game:
+    """One headless game on a ``ChessEngine``, with the draw rules the GUI engine leaves out.
+
+    After every move the position is adjudicated: checkmate, stalemate, the
+    fifty-move rule (on the engine's halfmove clock), threefold repetition,
+    insufficient material or the ``max_plies`` cap. ``legal`` holds the legal
+    moves of the side to move.
+    """
+
+    def __init__(self, index: int, players: tuple[str, str], max_plies: int):
+        self.index = index
+        self.players = players
+        self.max_plies = max_plies
+        self.engine = ChessEngine()
+        self.bitboard = self.engine.bitboard
+        self.moves: list[int] = []
+        self.opening_plies = 0
+        self.seen = Counter([self.bitboard.key])
+        self.result = self.reason = None
+        self.legal: list[int] = []
+        self.adjudicate()
+
+    @property
+    def player(self) -> str:
+        return self.players[self.bitboard.turn]
+
+    def play(self, move: int):
+        self.engine.make_move(move)
+        self.moves.append(move)
+        self.seen[self.bitboard.key] += 1
+        self.adjudicate()
+
+    def adjudicate(self):
+        bitboard = self.bitboard
+        self.legal = self.engine.legal_moves()
+        if not self.legal:
+            if is_in_check(bitboard):
+                self.result, self.reason = ('0-1' if bitboard.turn == 0 else '1-0'), 'checkmate'
+            else:
+                self.result, self.reason = '1/2-1/2', 'stalemate'
+        elif self.engine.halfmove_clock >= 100:
+            self.result, self.reason = '1/2-1/2', 'fifty moves'
+        elif self.seen[bitboard.key] >= 3:
+            self.result, self.reason = '1/2-1/2', 'repetition'
+        elif self.insufficient_material():
+            self.result, self.reason = '1/2-1/2', 'insufficient material'
+        elif len(self.moves) >= self.max_plies:
+            self.result, self.reason = '1/2-1/2', 'max plies'
+
+    def insufficient_material(self) -> bool:
+        """Bare kings, or a single knight or bishop left on the board."""
+        minors = 0
+        for pieces in self.bitboard.pieces:
+            if any(pieces[piece_type] for piece_type in range(6) if piece_type not in (KNIGHT, BISHOP, KING)):
+                return False
+            minors += bin(pieces[KNIGHT] | pieces[BISHOP]).count('1')
+        return minors <= 1
+
+    def record(self) -> dict:
+        white, black = self.players
+        return {'game': self.index, 'white': white, 'black': black, 'result': self.result, 'reason': self.reason,
+                'plies': len(self.moves), 'opening': self.opening_plies,
+                'moves': ' '.join(move_to_uci(move) for move in self.moves)}
+
+
+def new_game(index: int, players: tuple[str, str], opening_plies: int, max_plies: int, seed: int) -> Game:
+    """Game ``index`` with player A white on even indices; each pair shares a random opening."""
+    a, b = players
+    rng = random.Random(seed * 1_000_003 + index // 2)
+    while True:
+        game = Game(index, (a, b) if index % 2 == 0 else (b, a), max_plies)
+        while len(game.moves) < opening_plies and game.result is None:
+            game.play(rng.choice(game.legal))
+        if game.result is None:
+            game.opening_plies = len(game.moves)
+            return game
+
+
+def choose_moves(spec: str, games: list[Game], rng: random.Random, temperature: float) -> list[int]:
+    if spec == 'random':
+        return [rng.choice(game.legal) for game in games]
+    if spec.startswith('search'):
+        from app.ai.search import Searcher
+
+        nodes = int(spec.split(':', 1)[1]) if ':' in spec else 2000
+        return [Searcher(game.engine.detached_position(), time_limit=0, node_limit=nodes).search().move
+                for game in games]
+
+    batch = np.empty((len(games), PLANES, 8, 8), dtype=np.float32)
+    for row, game in enumerate(games):
+        board_to_matrix(game.engine, out=batch[row], moves=game.legal)
+    with torch.no_grad():
+        policies = torch.softmax(player_model(spec)(torch.from_numpy(batch)), dim=1).numpy()
+    moves = []
+    for game, policy in zip(games, policies):
+        ranked = rank_moves(policy, game.legal, None if temperature else 1)
+        if not ranked:
+            moves.append(rng.choice(game.legal))
+        elif temperature:
+            candidates, probabilities = zip(*ranked)
+            moves.append(rng.choices(candidates, [p ** (1 / temperature) for p in probabilities])[0])
+        else:
+            moves.append(ranked[0][0])
+    return moves
+
+
+def play_games(indices: list[int], players: tuple[str, str], opening_plies: int = 8, temperature: float = 0.0,
+               max_plies: int = 400, seed: int = 0) -> list[dict]:
+    """Play ``indices`` in lockstep: each step, all games waiting on the same model share one forward pass."""
+    rng = random.Random(seed * 1_000_003 + indices[0])
+    games = [new_game(index, players, opening_plies, max_plies, seed) for index in indices]
+    live = games
+    while live:
+        waiting = defaultdict(list)
+        for game in live:
+            waiting[game.player].append(game)
+        for spec, group in waiting.items():
+            for game, move in zip(group, choose_moves(spec, group, rng, temperature)):
+                game.play(move)
+        live = [game for game in live if game.result is None]
+    return [game.record() for game in games]
+
+
+def elo(score: float) -> float:
+    """Elo difference for an expected score, clamped to about +/-2400 at 0 and 1."""
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+def elo_interval(wins: int, draws: int, losses: int) -> tuple[float, float, float]:
+    """Elo difference implied by the score and the bounds of its 95% confidence interval.
+
+    The interval is the normal one on the mean score, with the trinomial
+    (win/draw/loss) variance; both score bounds are converted to Elo. The
+    per-game variance is floored at that of one decisive result among draws,
+    ``1 / (4 * games)``, so all-win or all-draw samples do not get a zero-width
+    interval. With no games the interval is unbounded.
+    """
+    games = wins + draws + losses
+    if not games:
+        return 0.0, -math.inf, math.inf
+    score = (wins + draws / 2) / games
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    margin = 1.96 * math.sqrt(max(variance, 1 / (4 * games)) / games)
+    return elo(score), elo(score - margin), elo(score + margin)
+
+
+def run_arena(players: tuple[str, str], games: int = 100, workers: int | None = None, games_per_task: int = 32,
+              opening_plies: int = 8, temperature: float = 0.0, max_plies: int = 400, seed: int = 0,
+              output=None) -> dict:
+    """Play ``games`` games between two players over a process pool, streaming a JSON line per game.
+
+    Scores are from the first player's side. Colors alternate and each pair of
+    games shares its random opening, so a deterministic pair of players still
+    produces distinct games.
+    """
+    workers = workers or os.cpu_count() or 1
+    tally = Counter()
+    reasons = Counter()
+    plies = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers, initializer=_init_worker) as executor:
+        tasks = [executor.submit(play_games, list(range(first, min(first + games_per_task, games))), players,
+                                 opening_plies, temperature, max_plies, seed)
+                 for first in range(0, games, games_per_task)]
+        for task in as_completed(tasks):
+            for record in task.result():
+                score = RESULT_SCORES[record['result']]
+                if record['game'] % 2:
+                    score = 1 - score
+                tally['win' if score == 1 else 'draw' if score == 0.5 else 'loss'] += 1
+                reasons[record['reason']] += 1
+                plies += record['plies']
+                if output is not None:
+                    output.write(json.dumps(record) + '\n')
+    elapsed = time.perf_counter() - start
+
+    wins, draws, losses = tally['win'], tally['draw'], tally['loss']
+    difference, low, high = elo_interval(wins, draws, losses)
+    score = (wins + draws / 2) / games if games else 0.5
+    print(f"{players[0]} vs {players[1]}: +{wins} ={draws} -{losses} "
+          f"score={score:.3f} elo={difference:+.0f} [{low:+.0f}, {high:+.0f}] (95%)")
+    print(f"games={games} workers={workers} time={elapsed:.1f}s games/sec={games / elapsed:.2f} "
+          f"moves/sec={plies / elapsed:.0f}")
+    print("endings: " + ', '.join(f"{reason}={count}" for reason, count in reasons.most_common()))
+    return {'wins': wins, 'draws': draws, 'losses': losses, 'elo': difference, 'elo_low': low, 'elo_high': high,
+            'games_per_sec': games / elapsed, 'moves_per_sec': plies / elapsed}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless self-play between two players, e.g. "
+                                                 "`policy policy:app/ai/models/new.pth` or `policy random`.")
+    parser.add_argument('players', nargs=2, type=player_spec,
+                        help="policy, policy:<checkpoint>, search[:<nodes>] or random; scores are the first's")
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--games-per-task', type=int, default=32, help="games played in lockstep per task")
+    parser.add_argument('--opening-plies', type=int, default=8, help="random plies shared by each game pair")
+    parser.add_argument('--temperature', type=float, default=0.0, help="sample policy moves; 0 plays the best")
+    parser.add_argument('--max-plies', type=int, default=400, help="adjudicate a draw after this many plies")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="JSON lines file for the game records ('-' for stdout)")
+    args = parser.parse_args()
+
+    if args.output == '-':
+        run_arena(tuple(args.players), args.games, args.workers, args.games_per_task, args.opening_plies,
+                  args.temperature, args.max_plies, args.seed, sys.stdout)
+    else:
+        with open(args.output or os.devnull, 'w') as records:
+            run_arena(tuple(args.players), args.games, args.workers, args.games_per_task, args.opening_plies,
+                      args.temperature, args.max_plies, args.seed, records)
@@ -0,0 +1,91 @@
+import argparse
+import random
+import time
+
+import numpy as np
+import torch
+
+from app.ai.prediction import rank_moves
+from app.ai.utils import board_to_matrix
+from app.core.config import settings
+from app.core.model import INFERENCE_BACKENDS, build_inference_model
+
+
+def sample_positions(count: int, seed: int = 0) -> list:
+    """A fixed set of positions: the perft reference positions plus seeded random-play positions."""
+    from app.ai.search import SearchPosition
+    from app.chess.bitboard import Bitboard
+    from app.chess.perft import POSITIONS
+
+    positions = [SearchPosition(Bitboard.from_fen(fen)) for fen, _ in POSITIONS.values()]
+    rng = random.Random(seed)
+    while len(positions) < count:
+        bitboard = Bitboard.from_fen(POSITIONS['start'][0])
+        for _ in range(rng.randint(4, 80)):
+            moves = bitboard.legal_moves()
+            if not moves:
+                break
+            bitboard.make_move(rng.choice(moves))
+        if bitboard.legal_moves():
+            positions.append(SearchPosition(bitboard))
+    return positions[:count]
+
+
+def policies(model, batch: np.ndarray) -> np.ndarray:
+    with torch.no_grad():
+        return torch.softmax(model(torch.from_numpy(batch)), dim=1).numpy()
+
+
+def time_call(call, repeat: int) -> float:
+    call()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - start) / repeat
+
+
+def report(backends: list[str], count: int = 256, batch_size: int = 64, repeat: int = 100):
+    """Compare each backend's policy and latency with the eager fp32 model on the same positions.
+
+    Agreement is the share of positions where the best legal move matches fp32;
+    the divergence columns are the mean KL divergence and the largest absolute
+    probability difference over the full policy.
+    """
+    positions = sample_positions(count)
+    batch = np.stack([board_to_matrix(position) for position in positions]).astype(np.float32)
+    reference_model = settings.FP32_MODEL
+    reference = policies(reference_model, batch)
+    reference_moves = [rank_moves(policy, position.legal_moves(), 1)[0][0]
+                       for policy, position in zip(reference, positions)]
+
+    print(f"{len(positions)} positions, batch latency over {batch_size} positions, threads={torch.get_num_threads()}")
+    print(f"{'backend':<12} {'agree':>7} {'mean KL':>9} {'max |dp|':>9} {'single ms':>10} {'batch ms':>9} "
+          f"{'pos/sec':>8}")
+    for backend in backends:
+        try:
+            model = build_inference_model(reference_model, backend)
+            result = policies(model, batch)
+        except Exception as error:  # e.g. torch.compile without a working toolchain
+            print(f"{backend:<12} unavailable: {type(error).__name__}: {error}".splitlines()[0])
+            continue
+        moves = [rank_moves(policy, position.legal_moves(), 1)[0][0] for policy, position in zip(result, positions)]
+        agreement = np.mean([ours == theirs for ours, theirs in zip(moves, reference_moves)])
+        kl = np.mean(np.sum(reference * (np.log(reference + 1e-12) - np.log(result + 1e-12)), axis=1))
+        max_diff = np.max(np.abs(reference - result))
+        single = time_call(lambda: policies(model, batch[:1]), repeat)
+        batched = time_call(lambda: policies(model, batch[:batch_size]), max(1, repeat // 10))
+        print(f"{backend:<12} {agreement:7.1%} {kl:9.2e} {max_diff:9.2e} {single * 1000:10.3f} "
+              f"{batched * 1000:9.2f} {batch_size / batched:8.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Accuracy vs latency of the inference backends against fp32.")
+    parser.add_argument('--backends', default=','.join(INFERENCE_BACKENDS))
+    parser.add_argument('--positions', type=int, default=256)
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--repeat', type=int, default=100)
+    parser.add_argument('--threads', type=int, help="torch.set_num_threads")
+    args = parser.parse_args()
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    report(args.backends.split(','), args.positions, args.batch_size, args.repeat)
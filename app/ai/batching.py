@@ -0,0 +1,82 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from app.ai.prediction import encode_request, rank_moves, request_policies, select_moves
+from app.chess.bitboard import move_to_uci
+from app.core.config import settings
+
+
+class MicroBatcher:
+    """Collects concurrent ``predict_move`` requests into batched forward passes.
+
+    A batch is flushed once it holds ``max_batch_size`` requests or the oldest
+    request has waited ``max_wait_ms``. Positions are encoded on ``submit`` so
+    callers may keep playing on their board while the future is pending. A
+    request with ``top_k`` resolves to ``[(uci, probability), ...]`` instead of
+    the best move.
+    """
+
+    def __init__(self, max_batch_size: int | None = None, max_wait_ms: float | None = None):
+        self.max_batch_size = max_batch_size or settings.BATCH_MAX_SIZE
+        self.max_wait = (settings.BATCH_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms) / 1000
+        self.requests: queue.Queue = queue.Queue()
+        self.batches = 0
+        self.positions = 0
+        self.thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self.thread.start()
+
+    def submit(self, chess, top_k: int | None = None) -> Future:
+        future = Future()
+        self.requests.put((encode_request(chess), top_k, future))
+        return future
+
+    def predict_move(self, chess) -> str | None:
+        return self.submit(chess).result()
+
+    def close(self):
+        self.requests.put(None)
+        self.thread.join()
+
+    def _run(self):
+        running = True
+        while running:
+            item = self.requests.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+            self._flush(batch)
+
+    def _flush(self, batch: list):
+        batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        requests = [request for request, _, _ in batch]
+        try:
+            policies = request_policies(requests)
+        except Exception as exc:
+            for _, _, future in batch:
+                future.set_exception(exc)
+            return
+        self.batches += 1
+        self.positions += len(requests)
+        for policy, ((_, moves, _), top_k, future) in zip(policies, batch):
+            if top_k is None:
+                future.set_result(select_moves([policy], [moves])[0])
+            else:
+                future.set_result([(move_to_uci(move), probability)
+                                   for move, probability in rank_moves(policy, moves, top_k)])
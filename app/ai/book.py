@@ -0,0 +1,218 @@
+import argparse
+import copy
+import io
+import mmap
+import random
+import struct
+import time
+from collections import defaultdict
+
+from app.chess.bitboard import Bitboard, move_to_uci
+from app.chess.perft import START_FEN
+
+ENTRY = struct.Struct('>QHHI')
+MAX_WEIGHT = 0xFFFF
+
+
+class OpeningBook:
+    """A read-only opening book in the Polyglot layout, looked up by binary search over ``mmap``.
+
+    Entries are 16 bytes, big-endian ``(key, move, weight, learn)`` sorted by
+    key, so the file is searched in place without being parsed. Unlike Polyglot
+    the key is ``Bitboard.key`` and the move is the packed 16-bit ``Bitboard``
+    move; both are stable across runs because the Zobrist keys are seeded.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if file.seek(0, 2) else b''
+        self.size = len(self.data) // ENTRY.size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def entries(self, key: int) -> list[tuple[int, int]]:
+        """``(move, weight)`` for every book move of ``key``, heaviest first."""
+        data, size = self.data, ENTRY.size
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            if struct.unpack_from('>Q', data, middle * size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        entries = []
+        while low < self.size:
+            entry_key, move, weight, _ = ENTRY.unpack_from(data, low * size)
+            if entry_key != key:
+                break
+            entries.append((move, weight))
+            low += 1
+        return entries
+
+    def choose(self, bitboard: Bitboard, rng: random.Random | None = None) -> int | None:
+        """A legal book move picked in proportion to its weight, or None when out of book."""
+        entries = self.entries(bitboard.key)
+        if not entries:
+            return None
+        # A key collision could hand back a move from another position.
+        legal = set(bitboard.legal_moves())
+        entries = [(move, weight) for move, weight in entries if move in legal and weight]
+        if not entries:
+            return None
+        moves, weights = zip(*entries)
+        return (rng or random).choices(moves, weights)[0]
+
+
+def probe(position) -> int | None:
+    """The configured book's move for ``position`` (an engine or ``SearchPosition``), if any."""
+    from app.core.config import settings
+
+    book = settings.OPENING_BOOK
+    return book.choose(position.bitboard) if book is not None else None
+
+
+def write_book(counts: dict[int, dict[int, float]], path: str) -> int:
+    """Write ``{key: {move: weight}}`` as a sorted book; weights are scaled to 16 bits per position."""
+    records = []
+    for key, moves in counts.items():
+        top = max(moves.values())
+        for move, weight in moves.items():
+            records.append((key, -weight, move, max(1, round(weight / top * MAX_WEIGHT))))
+    records.sort()
+    with open(path, 'wb') as file:
+        for key, _, move, weight in records:
+            file.write(ENTRY.pack(key, move, weight, 0))
+    return len(records)
+
+
+def counts_from_pgn(paths: list[str], max_ply: int = 20, min_count: int = 2,
+                    max_games: int | None = None) -> dict[int, dict[int, float]]:
+    """How often each move was played in each position over the first ``max_ply`` plies of the games."""
+    import chess.pgn
+
+    from app.ai.dataset import iter_game_texts
+
+    counts = defaultdict(lambda: defaultdict(int))
+    games = 0
+    for path in paths:
+        for text in iter_game_texts(path):
+            if max_games is not None and games >= max_games:
+                break
+            game = chess.pgn.read_game(io.StringIO(text))
+            if game is None or game.errors:
+                continue
+            games += 1
+            bitboard = Bitboard.from_fen(game.board().fen())
+            for ply, pgn_move in enumerate(game.mainline_moves()):
+                if ply >= max_ply:
+                    break
+                move = bitboard.parse_uci(pgn_move.uci())
+                if move is None:
+                    break
+                counts[bitboard.key][move] += 1
+                bitboard.make_move(move)
+    return {key: {move: count for move, count in moves.items() if count >= min_count}
+            for key, moves in counts.items() if max(moves.values()) >= min_count}
+
+
+def counts_from_policy(max_ply: int = 8, top_k: int = 3, min_probability: float = 0.05,
+                       fen: str = START_FEN) -> dict[int, dict[int, float]]:
+    """Expand the policy network's ``top_k`` moves ply by ply, one batched forward pass per ply.
+
+    Weights are the moves' probabilities among the legal moves; transpositions
+    are expanded once.
+    """
+    from app.ai.prediction import predict_policies_batch, rank_moves
+    from app.ai.search import SearchPosition
+
+    counts = {}
+    frontier = [Bitboard.from_fen(fen)]
+    for _ in range(max_ply):
+        frontier = [bitboard for bitboard in frontier if bitboard.key not in counts]
+        if not frontier:
+            break
+        positions = [SearchPosition(bitboard) for bitboard in frontier]
+        next_frontier = []
+        for position, policy in zip(positions, predict_policies_batch(positions)):
+            ranked = [(move, probability) for move, probability in rank_moves(policy, position.legal_moves(), top_k)
+                      if probability >= min_probability]
+            if not ranked:
+                continue
+            counts[position.key] = dict(ranked)
+            for move, _ in ranked:
+                child = copy.deepcopy(position.bitboard)
+                child.make_move(move)
+                next_frontier.append(child)
+        frontier = next_frontier
+    return counts
+
+
+def benchmark(path: str, count: int = 1000):
+    """Per-move latency of a book hit against the network's ``predict_move`` on the same positions."""
+    from app.ai.prediction import inference_cache, predict_move
+    from app.ai.search import SearchPosition
+
+    book = OpeningBook(path)
+    bitboard = Bitboard.from_fen(START_FEN)
+    positions = []
+    while len(positions) < 32:
+        move = book.choose(bitboard)
+        if move is None:
+            bitboard = Bitboard.from_fen(START_FEN)
+            continue
+        positions.append(SearchPosition(copy.deepcopy(bitboard)))
+        bitboard.make_move(move)
+
+    start = time.perf_counter()
+    for index in range(count):
+        book.choose(positions[index % len(positions)].bitboard)
+    book_time = (time.perf_counter() - start) / count
+    predict_move(positions[0])
+    start = time.perf_counter()
+    for position in positions:
+        inference_cache.clear()
+        predict_move(position)
+    model_time = (time.perf_counter() - start) / len(positions)
+    print(f"book entries={len(book)} book move={book_time * 1e6:.1f} us "
+          f"predict_move (uncached)={model_time * 1e6:.1f} us ({model_time / book_time:.0f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or query an opening book.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="build a book from PGN files or from the model's policy")
+    build.add_argument('output')
+    build.add_argument('--pgn', nargs='+', help="PGN files; without them the book is grown from the policy")
+    build.add_argument('--max-ply', type=int, help="plies per game (PGN, default 20) or tree depth (policy, 8)")
+    build.add_argument('--min-count', type=int, default=2, help="PGN: drop moves played fewer times")
+    build.add_argument('--max-games', type=int)
+    build.add_argument('--top-k', type=int, default=3, help="policy: moves expanded per position")
+    build.add_argument('--min-probability', type=float, default=0.05)
+    query = commands.add_parser('probe', help="list the book moves of a position")
+    query.add_argument('book')
+    query.add_argument('--fen', default=START_FEN)
+    bench = commands.add_parser('bench', help="book lookup vs network latency")
+    bench.add_argument('book')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        started = time.perf_counter()
+        if args.pgn:
+            book_counts = counts_from_pgn(args.pgn, args.max_ply or 20, args.min_count, args.max_games)
+        else:
+            book_counts = counts_from_policy(args.max_ply or 8, args.top_k, args.min_probability)
+        entries = write_book(book_counts, args.output)
+        print(f"positions={len(book_counts)} entries={entries} time={time.perf_counter() - started:.1f}s "
+              f"-> {args.output}")
+    elif args.command == 'probe':
+        board = Bitboard.from_fen(args.fen)
+        for book_move, book_weight in OpeningBook(args.book).entries(board.key):
+            print(f"{move_to_uci(book_move)} {book_weight}")
+    else:
+        benchmark(args.book)
@@ -0,0 +1,218 @@
+import argparse
+import io
+import os
+import pathlib
+import pickle
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+import numpy as np
+
+from app.ai.utils import PLANES, board_to_matrix
+from app.chess.epd import chunks
+
+PLANES_SUFFIX = 'positions'
+LABELS_SUFFIX = 'labels'
+
+_vocabulary = None
+
+
+def iter_game_texts(path: str) -> Iterator[str]:
+    """Yield the raw text of each game in a PGN file without parsing it, one line at a time."""
+    lines, in_moves = [], False
+    with open(path, encoding='utf-8', errors='replace') as file:
+        for line in file:
+            if line.startswith('[') and in_moves:
+                yield ''.join(lines)
+                lines, in_moves = [], False
+            elif line.strip() and not line.startswith('['):
+                in_moves = True
+            lines.append(line)
+    if in_moves:
+        yield ''.join(lines)
+
+
+def _init_worker(vocabulary: dict[str, int]):
+    global _vocabulary
+    _vocabulary = vocabulary
+
+
+def encode_games(texts: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Replay each game's mainline and return ``(uint8 planes (N, 13, 8, 8), int32 labels (N,))``.
+
+    Every position before a move becomes one sample labelled with that move's
+    class; moves missing from the vocabulary are skipped.
+    """
+    import chess.pgn
+
+    samples = []
+    for text in texts:
+        game = chess.pgn.read_game(io.StringIO(text))
+        if game is None or game.errors:
+            continue
+        board = game.board()
+        moves = list(game.mainline_moves())
+        samples.append((board, moves))
+
+    total = sum(len(moves) for _, moves in samples)
+    planes = np.empty((total, PLANES, 8, 8), dtype=np.uint8)
+    labels = np.empty(total, dtype=np.int32)
+    count = 0
+    for board, moves in samples:
+        for move in moves:
+            label = _vocabulary.get(move.uci())
+            if label is not None:
+                board_to_matrix(board, out=planes[count])
+                labels[count] = label
+                count += 1
+            board.push(move)
+    return planes[:count], labels[:count]
+
+
+def truncate_npy(path: pathlib.Path, length: int):
+    """Shrink an ``.npy`` file to its first ``length`` rows in place, without reading the data.
+
+    The header is rewritten with the new shape and padded to its old size, so
+    the data offset does not move; the file is then cut after the last row.
+    """
+    with open(path, 'r+b') as file:
+        version = np.lib.format.read_magic(file)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+        data_offset = file.tell()
+        shape = (length,) + shape[1:]
+        header = repr({'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': fortran_order,
+                       'shape': shape})
+        prefix = 10 if version == (1, 0) else 12
+        file.seek(prefix)
+        file.write((header.ljust(data_offset - prefix - 1) + '\n').encode('latin1'))
+        file.truncate(data_offset + int(np.prod(shape)) * dtype.itemsize)
+
+
+class ShardWriter:
+    """Appends samples to fixed-size ``.npy`` shards written through ``np.memmap``.
+
+    A shard holds ``shard_size`` samples as ``<prefix>-<n>-positions.npy``
+    (uint8, ``(N, 13, 8, 8)``) and ``<prefix>-<n>-labels.npy`` (int32). Only the
+    memory-mapped shard being filled is open, so memory stays bounded no matter
+    how large the input is; the last shard is truncated in place to its real length.
+    """
+
+    def __init__(self, out_dir: str, shard_size: int = 1 << 20, prefix: str = 'shard'):
+        self.out_dir = pathlib.Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.shard_size = shard_size
+        self.prefix = prefix
+        self.shards = 0
+        self.samples = 0
+        self.planes = self.labels = None
+        self.filled = 0
+
+    def path(self, index: int, suffix: str) -> pathlib.Path:
+        return self.out_dir / f"{self.prefix}-{index:05d}-{suffix}.npy"
+
+    def open_shard(self):
+        self.planes = np.lib.format.open_memmap(self.path(self.shards, PLANES_SUFFIX), mode='w+', dtype=np.uint8,
+                                                shape=(self.shard_size, PLANES, 8, 8))
+        self.labels = np.lib.format.open_memmap(self.path(self.shards, LABELS_SUFFIX), mode='w+', dtype=np.int32,
+                                                shape=(self.shard_size,))
+        self.filled = 0
+
+    def write(self, planes: np.ndarray, labels: np.ndarray):
+        start = 0
+        while start < len(labels):
+            if self.planes is None:
+                self.open_shard()
+            count = min(len(labels) - start, self.shard_size - self.filled)
+            self.planes[self.filled:self.filled + count] = planes[start:start + count]
+            self.labels[self.filled:self.filled + count] = labels[start:start + count]
+            self.filled += count
+            self.samples += count
+            start += count
+            if self.filled == self.shard_size:
+                self.close_shard()
+
+    def close_shard(self):
+        if self.planes is None:
+            return
+        self.planes.flush()
+        self.labels.flush()
+        # Drop the mappings before a partial shard's files are truncated under them.
+        self.planes = self.labels = None
+        if self.filled < self.shard_size:
+            truncate_npy(self.path(self.shards, PLANES_SUFFIX), self.filled)
+            truncate_npy(self.path(self.shards, LABELS_SUFFIX), self.filled)
+        self.shards += 1
+
+    def close(self):
+        self.close_shard()
+
+
+def load_vocabulary(path: str | None = None) -> dict[str, int]:
+    """UCI -> class index, from a vocabulary ``.npy``, a pickled ``move_to_int``, or the model's own."""
+    if path is None:
+        from app.core.config import settings
+        vocabulary = settings.VOCABULARY
+    elif str(path).endswith('.npy'):
+        vocabulary = np.load(path)
+    else:
+        with open(path, 'rb') as file:
+            return {str(move): int(index) for move, index in pickle.load(file).items()}
+    return {str(uci): index for index, uci in enumerate(vocabulary)}
+
+
+def build_dataset(pgn_paths: list[str], out_dir: str, workers: int | None = None, games_per_task: int = 64,
+                  shard_size: int = 1 << 20, max_games: int | None = None, vocabulary_path: str | None = None):
+    """Convert PGN files into memory-mapped shards with a process pool.
+
+    Games are read lazily and at most two tasks per worker are in flight, so the
+    reader never runs ahead of the encoders and memory stays bounded.
+    """
+    vocabulary = load_vocabulary(vocabulary_path)
+    writer = ShardWriter(out_dir, shard_size)
+
+    def games() -> Iterator[str]:
+        count = 0
+        for path in pgn_paths:
+            for text in iter_game_texts(path):
+                if max_games is not None and count >= max_games:
+                    return
+                count += 1
+                yield text
+
+    start = time.perf_counter()
+    game_count = 0
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(vocabulary,)) as executor:
+        pending = deque()
+        limit = 2 * workers
+        for texts in chunks(games(), games_per_task):
+            game_count += len(texts)
+            pending.append(executor.submit(encode_games, texts))
+            while len(pending) >= limit:
+                writer.write(*pending.popleft().result())
+        while pending:
+            writer.write(*pending.popleft().result())
+    writer.close()
+    elapsed = time.perf_counter() - start
+    print(f"games={game_count} samples={writer.samples} shards={writer.shards} time={elapsed:.1f}s "
+          f"samples/sec={writer.samples / elapsed if elapsed else 0:.0f}")
+    return writer
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert PGN files into (13x8x8 uint8, int32 label) npy shards.")
+    parser.add_argument('pgn', nargs='+')
+    parser.add_argument('--out', required=True, help="output directory for the shards")
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--games-per-task', type=int, default=64)
+    parser.add_argument('--shard-size', type=int, default=1 << 20, help="samples per shard")
+    parser.add_argument('--max-games', type=int)
+    parser.add_argument('--vocabulary', help="vocabulary .npy or pickled move_to_int; the model's by default")
+    args = parser.parse_args()
+    build_dataset(args.pgn, args.out, args.workers, args.games_per_task, args.shard_size, args.max_games,
+                  args.vocabulary)
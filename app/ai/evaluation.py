@@ -0,0 +1,113 @@
+from app.chess.bitboard import WHITE, BLACK, KING, QUEEN, iter_bits
+
+PIECE_VALUES = (100, 320, 330, 500, 900, 0)
+
+# Piece-square tables from white's point of view, written rank 8 first.
+_PAWN = (
+    0, 0, 0, 0, 0, 0, 0, 0,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    10, 10, 20, 30, 30, 20, 10, 10,
+    5, 5, 10, 25, 25, 10, 5, 5,
+    0, 0, 0, 20, 20, 0, 0, 0,
+    5, -5, -10, 0, 0, -10, -5, 5,
+    5, 10, 10, -20, -20, 10, 10, 5,
+    0, 0, 0, 0, 0, 0, 0, 0,
+)
+_KNIGHT = (
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20, 0, 0, 0, 0, -20, -40,
+    -30, 0, 10, 15, 15, 10, 0, -30,
+    -30, 5, 15, 20, 20, 15, 5, -30,
+    -30, 0, 15, 20, 20, 15, 0, -30,
+    -30, 5, 10, 15, 15, 10, 5, -30,
+    -40, -20, 0, 5, 5, 0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+)
+_BISHOP = (
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 10, 10, 5, 0, -10,
+    -10, 5, 5, 10, 10, 5, 5, -10,
+    -10, 0, 10, 10, 10, 10, 0, -10,
+    -10, 10, 10, 10, 10, 10, 10, -10,
+    -10, 5, 0, 0, 0, 0, 5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+)
+_ROOK = (
+    0, 0, 0, 0, 0, 0, 0, 0,
+    5, 10, 10, 10, 10, 10, 10, 5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    0, 0, 0, 5, 5, 0, 0, 0,
+)
+_QUEEN = (
+    -20, -10, -10, -5, -5, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 5, 5, 5, 0, -10,
+    -5, 0, 5, 5, 5, 5, 0, -5,
+    0, 0, 5, 5, 5, 5, 0, -5,
+    -10, 5, 5, 5, 5, 5, 0, -10,
+    -10, 0, 5, 0, 0, 0, 0, -10,
+    -20, -10, -10, -5, -5, -10, -10, -20,
+)
+_KING_MIDDLEGAME = (
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+    20, 20, 0, 0, 0, 0, 20, 20,
+    20, 30, 10, 0, 0, 10, 30, 20,
+)
+_KING_ENDGAME = (
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10, 0, 0, -10, -20, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -30, 0, 0, 0, 0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50,
+)
+
+
+def _square_scores(tables: tuple) -> list[list[int]]:
+    """Signed material + PST score per piece code and square (a1 = 0), white positive."""
+    scores = []
+    for color in (WHITE, BLACK):
+        for piece_type, table in enumerate(tables):
+            sign = 1 if color == WHITE else -1
+            row = []
+            for square in range(64):
+                # White reads the table upside down (rank 8 first); black mirrors ranks.
+                index = (7 - (square >> 3)) * 8 + (square & 7) if color == WHITE else square
+                row.append(sign * (PIECE_VALUES[piece_type] + table[index]))
+            scores.append(row)
+    return scores
+
+
+MIDDLEGAME_SCORES = _square_scores((_PAWN, _KNIGHT, _BISHOP, _ROOK, _QUEEN, _KING_MIDDLEGAME))
+ENDGAME_SCORES = _square_scores((_PAWN, _KNIGHT, _BISHOP, _ROOK, _QUEEN, _KING_ENDGAME))
+
+
+def evaluate(bitboard) -> int:
+    """Material plus piece-square score in centipawns from the side to move's point of view.
+
+    The king switches to its endgame table once both queens are off the board.
+    """
+    white, black = bitboard.pieces
+    scores = ENDGAME_SCORES if not (white[QUEEN] | black[QUEEN]) else MIDDLEGAME_SCORES
+    squares = bitboard.squares
+    score = 0
+    for square in iter_bits(bitboard.occupancy[0] | bitboard.occupancy[1]):
+        score += scores[squares[square]][square]
+    return score if bitboard.turn == WHITE else -score
+
+
+def is_in_check(bitboard) -> bool:
+    king = bitboard.pieces[bitboard.turn][KING]
+    return bool(king) and bitboard.is_attacked(king.bit_length() - 1, bitboard.turn ^ 1)
@@ -0,0 +1,83 @@
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.request
+
+import numpy as np
+
+from app.chess.bitboard import Bitboard, move_to_uci
+from app.chess.perft import START_FEN
+
+
+def random_requests(count: int, seed: int = 0) -> list[dict]:
+    """Seeded random-playout positions as ``POST /move`` bodies, half as a FEN and half as a move list."""
+    rng = random.Random(seed)
+    requests = []
+    while len(requests) < count:
+        bitboard = Bitboard.from_fen(START_FEN)
+        played = []
+        for _ in range(rng.randint(0, 60)):
+            moves = bitboard.legal_moves()
+            if not moves:
+                break
+            move = rng.choice(moves)
+            played.append(move_to_uci(move))
+            bitboard.make_move(move)
+        if bitboard.legal_moves():
+            requests.append({'fen': bitboard.fen()} if rng.random() < 0.5 else {'moves': played})
+    return requests
+
+
+def post(url: str, body: dict) -> dict:
+    request = urllib.request.Request(url, json.dumps(body).encode(), {'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)
+
+
+def run(url: str = 'http://127.0.0.1:8765', clients: int = 16, requests: int = 1000, top_k: int = 5):
+    """Closed-loop load: ``clients`` threads each post their share of ``requests`` back to back."""
+    bodies = random_requests(requests)
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def client(share: list[dict]):
+        for body in share:
+            started = time.perf_counter()
+            try:
+                post(f'{url}/move', {**body, 'top_k': top_k})
+            except OSError as error:
+                with lock:
+                    errors.append(error)
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+    before = json.load(urllib.request.urlopen(f'{url}/health'))
+    threads = [threading.Thread(target=client, args=(bodies[i::clients],)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    after = json.load(urllib.request.urlopen(f'{url}/health'))
+
+    batches = after['batches'] - before['batches']
+    positions = after['positions'] - before['positions']
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000 if latencies else (0, 0, 0)
+    print(f"clients={clients} requests={len(latencies)} errors={len(errors)} time={elapsed:.2f}s "
+          f"requests/sec={len(latencies) / elapsed:.0f}")
+    print(f"latency ms: p50={p50:.1f} p95={p95:.1f} p99={p99:.1f}")
+    print(f"batches={batches} mean batch={positions / batches if batches else 0:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test a running `python -m app.ai.server --http PORT`.")
+    parser.add_argument('--url', default='http://127.0.0.1:8765')
+    parser.add_argument('--clients', type=int, default=16, help="concurrent client threads")
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--top-k', type=int, default=5)
+    args = parser.parse_args()
+    run(args.url, args.clients, args.requests, args.top_k)
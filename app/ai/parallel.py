@@ -0,0 +1,176 @@
+import argparse
+import atexit
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import torch
+
+from app.ai.search import SearchPosition, SearchResult, Searcher
+from app.ai.transposition import TranspositionTable, MAX_GENERATION
+from app.chess.bitboard import Bitboard
+from app.core.config import settings
+
+_worker_memory = None
+_worker_table = None
+_worker_stop = None
+_parallel_searcher = None
+
+
+def _init_worker(memory_name: str, stop_name: str):
+    """Runs once per worker process: attach the shared table and stop flag and keep torch to one thread."""
+    global _worker_memory, _worker_table, _worker_stop
+    torch.set_num_threads(1)
+    _worker_memory = shared_memory.SharedMemory(name=memory_name)
+    _worker_table = TranspositionTable(buffer=_worker_memory.buf)
+    _worker_stop = shared_memory.SharedMemory(name=stop_name)
+    # Load the model now rather than inside the first timed search.
+    settings.MODEL
+
+
+def _search_worker(bitboard: Bitboard, worker_id: int, generation: int, limits: dict) -> SearchResult:
+    _worker_table.generation = generation
+    # Lazy SMP: helpers start one ply deeper on odd ids so they desynchronise from
+    # the main thread and fill the table with entries it will need next.
+    searcher = Searcher(SearchPosition(bitboard), table=_worker_table, start_depth=1 + worker_id % 2,
+                        stop_flag=_worker_stop.buf, **limits)
+    return searcher.search()
+
+
+class ParallelSearcher:
+    """Lazy SMP over a pool of processes sharing one transposition table.
+
+    Every worker searches the same root with its own ``Searcher``; they cooperate
+    only through the table, which lives in a ``multiprocessing.shared_memory``
+    block (its entries are XOR-verified, so no locking is needed). The deepest
+    finished result wins, ties going to the best score. Each worker loads the
+    model once when the pool starts and reuses it for every search.
+
+    ``stop()`` sets a one-byte shared memory flag the workers poll alongside
+    their own limits; it is cleared when the search returns.
+    """
+
+    def __init__(self, workers: int | None = None, table_mb: int | None = None):
+        self.workers = workers or settings.SEARCH_WORKERS
+        table_mb = table_mb or settings.TRANSPOSITION_TABLE_MB
+        self.memory = shared_memory.SharedMemory(create=True, size=table_mb * 1024 * 1024)
+        self.table = TranspositionTable(buffer=self.memory.buf)
+        self.stop_memory = shared_memory.SharedMemory(create=True, size=1)
+        self.clear_stop()
+        self.executor = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                            initargs=(self.memory.name, self.stop_memory.name))
+
+    def search(self, engine, time_limit: float | None = None, node_limit: int | None = None,
+               max_depth: int | None = None, policy_plies: int | None = None) -> SearchResult:
+        limits = {'time_limit': time_limit, 'max_depth': max_depth, 'policy_plies': policy_plies,
+                  'node_limit': node_limit // self.workers if node_limit else node_limit}
+        generation = self.table.generation
+        start = time.monotonic()
+        futures = [self.executor.submit(_search_worker, engine.bitboard, worker_id, generation, limits)
+                   for worker_id in range(self.workers)]
+        try:
+            results = [future.result() for future in futures]
+        finally:
+            self.clear_stop()
+        self.table.generation = (generation + 1) & MAX_GENERATION
+
+        best = max(results, key=lambda result: (result.depth, result.score))
+        best.nodes = sum(result.nodes for result in results)
+        best.elapsed = time.monotonic() - start
+        return best
+
+    def stop(self):
+        self.stop_memory.buf[0] = 1
+
+    def clear_stop(self):
+        self.stop_memory.buf[0] = 0
+
+    def close(self):
+        self.executor.shutdown()
+        self.table.release()
+        self.memory.close()
+        self.memory.unlink()
+        self.stop_memory.close()
+        self.stop_memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ParallelSearch:
+    """One stoppable search of ``position`` on a ``ParallelSearcher``, used like a ``Searcher``.
+
+    ``stop()`` may come from another thread before, during or after ``search()``:
+    early stops are applied as soon as the workers start, late ones are ignored
+    so they cannot leak into the next search.
+    """
+
+    def __init__(self, searcher: ParallelSearcher, position, **limits):
+        self.searcher = searcher
+        self.position = position
+        self.limits = limits
+        self.lock = threading.Lock()
+        self.running = False
+        self.stopped = False
+
+    def search(self) -> SearchResult:
+        with self.lock:
+            self.running = True
+            if self.stopped:
+                self.searcher.stop()
+        try:
+            return self.searcher.search(self.position, **self.limits)
+        finally:
+            with self.lock:
+                self.running = False
+                self.searcher.clear_stop()
+
+    def stop(self):
+        with self.lock:
+            self.stopped = True
+            if self.running:
+                self.searcher.stop()
+
+
+def shared_searcher() -> ParallelSearcher:
+    """The process-wide pool of ``SEARCH_WORKERS`` processes, started on first use."""
+    global _parallel_searcher
+    if _parallel_searcher is None:
+        _parallel_searcher = ParallelSearcher()
+        atexit.register(_parallel_searcher.close)
+    return _parallel_searcher
+
+
+def parallel_search(engine, **limits) -> SearchResult:
+    return shared_searcher().search(engine, **limits)
+
+
+def benchmark(worker_counts: list[int], time_limit: float, table_mb: int):
+    """Nodes per second of a fixed-time search from the initial position for each worker count."""
+    from app.chess.engine import ChessEngine
+
+    engine = ChessEngine()
+    baseline = None
+    for workers in worker_counts:
+        with ParallelSearcher(workers, table_mb) as searcher:
+            # Warm-up search so process start-up and model loading are not timed.
+            searcher.search(engine, time_limit=0.1)
+            searcher.table.clear()
+            result = searcher.search(engine, time_limit=time_limit)
+        baseline = baseline or result.nps
+        print(f"workers={workers:<3} depth={result.depth:<3} nodes={result.nodes:<9} "
+              f"nps={result.nps:<8} speedup={result.nps / baseline:.2f}x move={result.uci}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Lazy SMP search throughput per worker count.")
+    parser.add_argument('--workers', default=','.join(str(n) for n in sorted({1, 2, 4, os.cpu_count() or 1})))
+    parser.add_argument('--time', type=float, default=5.0, help="seconds per search")
+    parser.add_argument('--table-mb', type=int, default=settings.TRANSPOSITION_TABLE_MB)
+    args = parser.parse_args()
+    benchmark([int(n) for n in args.workers.split(',')], args.time, args.table_mb)
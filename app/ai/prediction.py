@@ -1,28 +1,143 @@
+import threading
+from functools import lru_cache
+
 import numpy as np
 import torch
 
-from app.ai.utils import board_to_matrix
+from app.ai.cache import InferenceCache
+from app.ai.utils import PLANES, board_to_matrix
+from app.chess.bitboard import PIECE_LETTERS, PROMOTION, move_to_uci
 from app.core.config import settings
 
+
+def build_move_classes(move_to_int: dict) -> np.ndarray:
+    """Dense table from ``from | to << 6 | promoted piece << 12`` to model class, -1 when not in the vocabulary."""
+    classes = np.full(8 << 12, -1, dtype=np.int32)
+    for index, uci in move_to_int.items():
+        from_square = ord(uci[0]) - ord('a') + (int(uci[1]) - 1) * 8
+        to_square = ord(uci[2]) - ord('a') + (int(uci[3]) - 1) * 8
+        promotion = PIECE_LETTERS.index(uci[4]) if len(uci) > 4 else 0
+        classes[from_square | (to_square << 6) | (promotion << 12)] = index
+    return classes
+
+
+@lru_cache(maxsize=None)
+def move_class_table() -> np.ndarray:
+    """``build_move_classes`` over the model vocabulary, built on first use."""
+    return build_move_classes(settings.MOVE_TO_INT)
+
+
+inference_cache = InferenceCache(settings.INFERENCE_CACHE_SIZE)
+_buffers = threading.local()
+
+
+def input_buffer(size: int) -> np.ndarray:
+    """Per-thread float32 ``(size, 13, 8, 8)`` encoding buffer, grown on demand and reused."""
+    buffer = getattr(_buffers, 'batch', None)
+    if buffer is None or len(buffer) < size:
+        buffer = _buffers.batch = np.empty((max(size, 1), PLANES, 8, 8), dtype=np.float32)
+    return buffer[:size]
+
+
 def prepare_input(chess):
-    matrix = board_to_matrix(chess)
-    X_tensor = torch.tensor(matrix, dtype=torch.float32).unsqueeze(0)
+    X_tensor = torch.empty((1, PLANES, 8, 8), dtype=torch.float32)
+    board_to_matrix(chess, out=X_tensor.numpy()[0])
     return X_tensor
 
 
-def predict_move(chess):
-    X_tensor = prepare_input(chess).to(settings.DEVICE)
+def run_model(batch: np.ndarray) -> np.ndarray:
+    """One forward pass over a float32 ``(N, 13, 8, 8)`` batch, returning ``(N, classes)`` probabilities."""
+    X_tensor = torch.from_numpy(batch).to(settings.DEVICE)
     with torch.no_grad():
         logits = settings.MODEL(X_tensor)
-    logits = logits.squeeze(0)  # Remove batch dimension
-    probabilities = torch.softmax(logits, dim=0).cpu().numpy()  # Convert to probabilities
-
-    legal_moves = chess.get_legal_moves()
-    legal_moves_uci = chess.utils.convert_moves_to_uci(legal_moves)
-
-    sorted_indices = np.argsort(probabilities)[::-1]
-    for move_index in sorted_indices:
-        move = settings.MOVE_TO_INT[move_index]
-        if move in legal_moves_uci:
-            return move
-    return None
+    return torch.softmax(logits, dim=1).cpu().numpy()
+
+
+def get_policies(keys: list[int], encode) -> list[np.ndarray]:
+    """Policies for ``keys``; cache misses are written by ``encode(i, out)`` into one batch buffer."""
+    policies = [inference_cache.get(key) for key in keys]
+    missing = [i for i, policy in enumerate(policies) if policy is None]
+    if missing:
+        batch = input_buffer(len(missing))
+        for row, i in enumerate(missing):
+            encode(i, batch[row])
+        for i, probabilities in zip(missing, run_model(batch)):
+            probabilities = probabilities.copy()
+            probabilities.setflags(write=False)
+            inference_cache.put(keys[i], probabilities)
+            policies[i] = probabilities
+    return policies
+
+
+def move_classes(moves) -> np.ndarray:
+    """Model class of every packed move (-1 for moves outside the vocabulary)."""
+    moves = np.asarray(moves, dtype=np.int32)
+    flags = moves >> 12
+    promotion = np.where(flags & PROMOTION, flags & 7, 0)
+    return move_class_table()[(moves & 0xFFF) | (promotion << 12)]
+
+
+def rank_moves(policy: np.ndarray, moves: list[int], k: int | None = None) -> list[tuple[int, float]]:
+    """Top ``k`` (all when ``None``) of the packed ``moves`` by policy, best first.
+
+    Only the legal moves' classes are looked at; probabilities are renormalized over
+    them, which equals a softmax over logits with every illegal class set to -inf.
+    """
+    moves = np.asarray(moves, dtype=np.int32)
+    classes = move_classes(moves)
+    known = classes >= 0
+    moves, classes = moves[known], classes[known]
+    if not len(moves):
+        return []
+    scores = policy[classes]
+    if k is None or k >= len(scores):
+        order = np.argsort(-scores)
+    else:
+        top = np.argpartition(-scores, k - 1)[:k]
+        order = top[np.argsort(-scores[top])]
+    total = float(scores.sum()) or 1.0
+    return [(int(moves[i]), float(scores[i]) / total) for i in order]
+
+
+def select_moves(policies: list[np.ndarray], legal_moves: list[list[int]]) -> list[str | None]:
+    """Most probable legal move of every row."""
+    selected = []
+    for policy, moves in zip(policies, legal_moves):
+        ranked = rank_moves(policy, moves, 1)
+        selected.append(move_to_uci(ranked[0][0]) if ranked else None)
+    return selected
+
+
+def encode_request(chess) -> tuple[int, list[int], np.ndarray]:
+    """Snapshot of everything inference needs, so the board can change while the request is queued."""
+    moves = chess.legal_moves()
+    return chess.key, moves, board_to_matrix(chess, moves=moves)
+
+
+def request_policies(requests: list[tuple[int, list[int], np.ndarray]]) -> list[np.ndarray]:
+    return get_policies([key for key, _, _ in requests], lambda i, out: np.copyto(out, requests[i][2]))
+
+
+def predict_policies_batch(positions: list) -> list[np.ndarray]:
+    return get_policies([chess.key for chess in positions], lambda i, out: board_to_matrix(positions[i], out))
+
+
+def predict_moves_batch(positions: list) -> list[str | None]:
+    """Best legal move for every position, running the model once for all uncached ones."""
+    return select_moves(predict_policies_batch(positions), [chess.legal_moves() for chess in positions])
+
+
+def predict_policy(chess) -> np.ndarray:
+    """Softmax over every move class for the current position, served from the LRU cache when possible."""
+    return get_policies([chess.key], lambda i, out: board_to_matrix(chess, out))[0]
+
+
+def predict_top_k(chess, k: int = 5) -> list[tuple[str, float]]:
+    """The ``k`` most probable legal moves as ``(uci, probability among legal moves)``."""
+    return [(move_to_uci(move), probability)
+            for move, probability in rank_moves(predict_policy(chess), chess.legal_moves(), k)]
+
+
+def predict_move(chess):
+    ranked = predict_top_k(chess, 1)
+    return ranked[0][0] if ranked else None
@@ -0,0 +1,347 @@
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+
+from app.ai.evaluation import PIECE_VALUES, evaluate, is_in_check
+from app.ai.prediction import predict_policy, rank_moves
+from app.ai.transposition import TranspositionTable, EXACT, LOWER, UPPER
+from app.chess.bitboard import EN_PASSANT, PROMOTION, move_to_uci, new_move_buffer
+from app.core.config import settings
+
+INFINITY = 32000
+MATE = 31000
+MATE_BOUND = MATE - 1000
+
+_default_table = None
+
+
+def default_table() -> TranspositionTable:
+    global _default_table
+    if _default_table is None:
+        _default_table = TranspositionTable(settings.TRANSPOSITION_TABLE_MB * 1024 * 1024)
+    return _default_table
+
+
+class SearchStopped(Exception):
+    pass
+
+
+@dataclass
+class SearchResult:
+    move: int | None
+    score: int
+    depth: int
+    nodes: int
+    elapsed: float
+    pv: list[str] = field(default_factory=list)
+
+    @property
+    def nps(self) -> int:
+        return int(self.nodes / self.elapsed) if self.elapsed > 0 else 0
+
+    @property
+    def uci(self) -> str | None:
+        return move_to_uci(self.move) if self.move is not None else None
+
+
+class SearchPosition:
+    """The part of ``ChessEngine`` a ``Searcher`` needs, wrapped around a bare bitboard."""
+
+    def __init__(self, bitboard):
+        self.bitboard = bitboard
+
+    @property
+    def key(self) -> int:
+        return self.bitboard.key
+
+    def legal_moves(self) -> list[int]:
+        return self.bitboard.legal_moves()
+
+
+class Searcher:
+    """Iterative-deepening principal variation search on an engine's bitboard.
+
+    The search makes and unmakes moves on ``engine.bitboard`` only, so the piece
+    grid is left untouched. Near the root (``policy_plies``) moves are ordered by
+    the ``ChessModel`` policy, deeper nodes by TT move, MVV-LVA, killers and
+    history; leaves go through a capture-only quiescence search on the
+    material/PST evaluation. Limits are a time budget, a node budget and a depth;
+    ``stop()`` may be called from another thread, and a nonzero ``stop_flag[0]``
+    (e.g. a shared memory byte) stops it from another process.
+    """
+
+    def __init__(self, engine, time_limit: float | None = None, node_limit: int | None = None,
+                 max_depth: int | None = None, policy_plies: int | None = None,
+                 table: TranspositionTable | None = None, on_iteration=None, start_depth: int = 1,
+                 stop_flag=None):
+        self.engine = engine
+        self.board = engine.bitboard
+        self.time_limit = settings.SEARCH_TIME_MS / 1000 if time_limit is None else time_limit
+        self.node_limit = settings.SEARCH_MAX_NODES if node_limit is None else node_limit
+        self.max_depth = max_depth or settings.SEARCH_MAX_DEPTH
+        self.policy_plies = settings.SEARCH_POLICY_PLIES if policy_plies is None else policy_plies
+        self.table = table or default_table()
+        self.on_iteration = on_iteration
+        self.start_depth = start_depth
+        self.stop_flag = stop_flag
+        self.nodes = 0
+        self.stopped = False
+        self.deadline = None
+        self.killers = [[0, 0] for _ in range(128)]
+        self.history = {}
+        # One move buffer per ply, reused by every node at that ply.
+        self.move_buffers = [new_move_buffer() for _ in range(64)]
+
+    def stop(self):
+        self.stopped = True
+
+    def search(self) -> SearchResult:
+        self.table.new_search()
+        self.nodes = 0
+        start = time.monotonic()
+        self.deadline = start + self.time_limit if self.time_limit else None
+        root_moves = self.board.legal_moves()
+        result = SearchResult(root_moves[0] if root_moves else None, 0, 0, 0, 0.0)
+        if len(root_moves) <= 1:
+            result.pv = [move_to_uci(move) for move in root_moves]
+            return result
+
+        for depth in range(min(self.start_depth, self.max_depth), self.max_depth + 1):
+            try:
+                score, move = self.search_root(root_moves, depth)
+            except SearchStopped:
+                break
+            elapsed = time.monotonic() - start
+            result = SearchResult(move, score, depth, self.nodes, elapsed, self.principal_variation(depth))
+            if self.on_iteration:
+                self.on_iteration(result)
+            if abs(score) >= MATE_BOUND:
+                break
+            # The next iteration costs several times this one; don't start what can't finish.
+            if self.deadline and time.monotonic() + elapsed * 2 > self.deadline:
+                break
+        result.nodes = self.nodes
+        result.elapsed = time.monotonic() - start
+        return result
+
+    def search_root(self, moves: list[int], depth: int) -> tuple[int, int]:
+        board = self.board
+        entry = self.table.probe(board.key)
+        ordered = self.order_moves(moves, entry[0] if entry else 0, 0)
+        alpha, beta = -INFINITY, INFINITY
+        best_move = ordered[0]
+        for index, move in enumerate(ordered):
+            board.make_move(move)
+            try:
+                if index == 0:
+                    score = -self.negamax(depth - 1, -beta, -alpha, 1)
+                else:
+                    score = -self.negamax(depth - 1, -alpha - 1, -alpha, 1)
+                    if score > alpha:
+                        score = -self.negamax(depth - 1, -beta, -alpha, 1)
+            finally:
+                board.unmake_move()
+            if score > alpha:
+                alpha, best_move = score, move
+        self.table.store(board.key, best_move, alpha, depth, EXACT)
+        return alpha, best_move
+
+    def negamax(self, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self.nodes += 1
+        if not self.nodes & 1023:
+            self.check_limits()
+        board = self.board
+        if self.is_repetition():
+            return 0
+
+        in_check = is_in_check(board)
+        if in_check:
+            depth += 1
+        if depth <= 0:
+            return self.quiesce(alpha, beta, ply)
+
+        key = board.key
+        tt_move = 0
+        entry = self.table.probe(key)
+        if entry:
+            tt_move, tt_score, tt_depth, bound = entry
+            tt_score = score_from_table(tt_score, ply)
+            if tt_depth >= depth and beta - alpha == 1:
+                if bound == EXACT or (bound == LOWER and tt_score >= beta) or (bound == UPPER and tt_score <= alpha):
+                    return tt_score
+
+        moves = self.moves_at(ply)
+        count = board.generate_moves(moves)
+        if not count:
+            return -MATE + ply if in_check else 0
+
+        original_alpha = alpha
+        best_score, best_move = -INFINITY, 0
+        for index, move in enumerate(self.order_moves(islice(moves, count), tt_move, ply)):
+            board.make_move(move)
+            try:
+                if index == 0:
+                    score = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+                else:
+                    score = -self.negamax(depth - 1, -alpha - 1, -alpha, ply + 1)
+                    if alpha < score < beta:
+                        score = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                board.unmake_move()
+            if score > best_score:
+                best_score, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if not self.is_capture(move):
+                            self.remember_quiet(move, depth, ply)
+                        break
+
+        if best_score <= original_alpha:
+            bound = UPPER
+        elif best_score >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.table.store(key, best_move, score_to_table(best_score, ply), depth, bound)
+        return best_score
+
+    def quiesce(self, alpha: int, beta: int, ply: int) -> int:
+        self.nodes += 1
+        if not self.nodes & 1023:
+            self.check_limits()
+        board = self.board
+        in_check = is_in_check(board)
+        if not in_check:
+            stand_pat = evaluate(board)
+            if stand_pat >= beta:
+                return stand_pat
+            alpha = max(alpha, stand_pat)
+
+        buffer = self.moves_at(ply)
+        count = board.generate_moves(buffer)
+        if not count:
+            return -MATE + ply if in_check else 0
+        if in_check:
+            moves = buffer[:count].tolist()
+        else:
+            moves = [move for move in islice(buffer, count) if self.is_capture(move) or move >> 12 & PROMOTION]
+        moves.sort(key=self.capture_score, reverse=True)
+        best_score = alpha if not in_check else -INFINITY
+        for move in moves:
+            board.make_move(move)
+            try:
+                score = -self.quiesce(-beta, -alpha, ply + 1)
+            finally:
+                board.unmake_move()
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best_score
+
+    def order_moves(self, moves, tt_move: int, ply: int) -> list[int]:
+        """``moves`` (any iterable of packed moves) best first; always a new list."""
+        if ply < self.policy_plies:
+            moves = list(moves)
+            ranked = [move for move, _ in rank_moves(predict_policy(self.engine), moves)]
+            ordered = ranked + [move for move in moves if move not in ranked]
+        else:
+            killers = self.killers[ply] if ply < len(self.killers) else (0, 0)
+            history = self.history
+
+            def score(move: int) -> int:
+                if self.is_capture(move) or move >> 12 & PROMOTION:
+                    return 1_000_000 + self.capture_score(move)
+                if move == killers[0]:
+                    return 900_000
+                if move == killers[1]:
+                    return 800_000
+                return history.get(move & 0xFFF, 0)
+
+            ordered = sorted(moves, key=score, reverse=True)
+        if tt_move and tt_move in ordered:
+            ordered.remove(tt_move)
+            ordered.insert(0, tt_move)
+        return ordered
+
+    def moves_at(self, ply: int):
+        buffers = self.move_buffers
+        while len(buffers) <= ply:
+            buffers.append(new_move_buffer())
+        return buffers[ply]
+
+    def is_capture(self, move: int) -> bool:
+        return self.board.squares[(move >> 6) & 63] is not None or move >> 12 == EN_PASSANT
+
+    def capture_score(self, move: int) -> int:
+        """MVV-LVA: most valuable victim first, then least valuable attacker."""
+        squares = self.board.squares
+        victim = squares[(move >> 6) & 63]
+        flags = move >> 12
+        if victim is not None:
+            victim_value = PIECE_VALUES[victim % 6]
+        else:
+            victim_value = PIECE_VALUES[0] if flags == EN_PASSANT else 0
+        if flags & PROMOTION:
+            victim_value += PIECE_VALUES[flags & 7]
+        return victim_value * 10 - PIECE_VALUES[squares[move & 63] % 6] // 100
+
+    def remember_quiet(self, move: int, depth: int, ply: int):
+        if ply < len(self.killers):
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers[1], killers[0] = killers[0], move
+        self.history[move & 0xFFF] = self.history.get(move & 0xFFF, 0) + depth * depth
+
+    def is_repetition(self) -> bool:
+        key = self.board.key
+        history = self.board.history
+        for index in range(len(history) - 2, max(-1, len(history) - 100), -2):
+            if history[index] >> 31 == key:
+                return True
+        return False
+
+    def check_limits(self):
+        if self.stopped or (self.deadline and time.monotonic() >= self.deadline) \
+                or (self.node_limit and self.nodes >= self.node_limit) \
+                or (self.stop_flag is not None and self.stop_flag[0]):
+            self.stopped = True
+            raise SearchStopped
+
+    def principal_variation(self, depth: int) -> list[str]:
+        board = self.board
+        pv = []
+        for ply in range(depth):
+            entry = self.table.probe(board.key)
+            moves = self.moves_at(ply)
+            if not entry or entry[0] not in islice(moves, board.generate_moves(moves)):
+                break
+            pv.append(entry[0])
+            board.make_move(entry[0])
+        for _ in pv:
+            board.unmake_move()
+        return [move_to_uci(move) for move in pv]
+
+
+def score_to_table(score: int, ply: int) -> int:
+    """Store mate scores relative to the node instead of the root."""
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def score_from_table(score: int, ply: int) -> int:
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
+
+
+def search(engine, **limits) -> SearchResult:
+    return Searcher(engine, **limits).search()
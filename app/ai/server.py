@@ -0,0 +1,282 @@
+import argparse
+import json
+import queue
+import sys
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.ai.batching import MicroBatcher
+from app.ai.search import MATE_BOUND, MATE, SearchResult, Searcher
+from app.chess.engine import ChessEngine
+from app.chess.perft import START_FEN
+from app.core.config import settings
+
+
+class EnginePool:
+    """Headless engines handed out to request threads.
+
+    Every engine shares the process-wide ``settings.MODEL``; policy requests go
+    through one ``MicroBatcher`` so concurrent requests share forward passes.
+    An engine is only held while its position is set up and encoded.
+    """
+
+    def __init__(self, size: int = 8, batcher: MicroBatcher | None = None):
+        self.batcher = batcher or MicroBatcher()
+        self.engines: queue.Queue = queue.Queue()
+        for _ in range(size):
+            self.engines.put(ChessEngine())
+        self.requests = 0
+
+    @contextmanager
+    def engine(self, fen: str | None = None, moves: list[str] = ()):
+        engine = self.engines.get()
+        try:
+            engine.load_fen(fen or START_FEN)
+            for uci in moves:
+                move = engine.bitboard.parse_uci(uci)
+                if move is None:
+                    raise ValueError(f"illegal move {uci!r} in {engine.fen()}")
+                engine.make_move(move)
+            yield engine
+        finally:
+            self.engines.put(engine)
+
+    def analyse(self, fen: str | None = None, moves: list[str] = (), top_k: int = 5, mode: str = 'policy',
+                movetime: int | None = None) -> dict:
+        """Best move and top-k policy for a position; ``mode='search'`` also runs the alpha-beta search."""
+        self.requests += 1
+        with self.engine(fen, moves) as engine:
+            fen = engine.fen()
+            pending = self.batcher.submit(engine, top_k)
+            position = engine.detached_position() if mode == 'search' else None
+        policy = pending.result()
+        response = {'fen': fen, 'bestmove': policy[0][0] if policy else None,
+                    'policy': [{'move': move, 'probability': probability} for move, probability in policy]}
+        if position is not None:
+            time_limit = (movetime if movetime is not None else settings.SEARCH_TIME_MS) / 1000
+            result = Searcher(position, time_limit=time_limit).search()
+            response.update(bestmove=result.uci, score=result.score, depth=result.depth, nodes=result.nodes,
+                            pv=result.pv)
+        return response
+
+    def stats(self) -> dict:
+        batcher = self.batcher
+        return {'requests': self.requests, 'batches': batcher.batches, 'positions': batcher.positions,
+                'mean_batch': batcher.positions / batcher.batches if batcher.batches else 0.0}
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """``POST /move`` with ``{"fen", "moves", "top_k", "mode", "movetime"}``; ``GET /health`` for pool stats."""
+
+    pool: EnginePool = None
+
+    def do_GET(self):
+        if self.path == '/health':
+            self.send_json(200, {'status': 'ok', **self.pool.stats()})
+        else:
+            self.send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if self.path != '/move':
+            self.send_json(404, {'error': 'not found'})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            if not isinstance(body, dict):
+                raise ValueError("the request body must be a JSON object")
+            fen, moves, top_k = body.get('fen'), body.get('moves', []), int(body.get('top_k', 5))
+            mode, movetime = body.get('mode', 'policy'), body.get('movetime')
+            if fen is not None and not isinstance(fen, str):
+                raise ValueError("'fen' must be a string")
+            if not isinstance(moves, list) or not all(isinstance(move, str) for move in moves):
+                raise ValueError("'moves' must be a list of UCI strings")
+            if top_k < 1:
+                raise ValueError("'top_k' must be at least 1")
+            if mode not in ('policy', 'search'):
+                raise ValueError("'mode' must be 'policy' or 'search'")
+            response = self.pool.analyse(fen, moves, top_k, mode, None if movetime is None else int(movetime))
+        except (ValueError, TypeError, KeyError) as error:
+            self.send_json(400, {'error': str(error)})
+            return
+        self.send_json(200, response)
+
+    def send_json(self, status: int, payload: dict):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class EngineHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections as soon as a few dozen clients connect at once.
+    request_queue_size = 128
+
+
+def serve_http(pool: EnginePool, host: str = '127.0.0.1', port: int = 8765) -> EngineHTTPServer:
+    handler = type('PoolRequestHandler', (RequestHandler,), {'pool': pool})
+    server = EngineHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name='http-server', daemon=True).start()
+    return server
+
+
+class UciSession:
+    """The UCI protocol over text streams: ``position``, ``go``/``stop`` and the handshake commands.
+
+    ``go`` runs in a background thread so ``stop`` and ``isready`` are answered
+    while thinking. The ``Mode`` option switches between the policy network's
+    move (instant) and the alpha-beta search with the usual time, depth and
+    node limits. The position and ``Searcher`` are set up before the thread
+    starts, so a ``stop`` right after ``go`` always has something to stop;
+    ``go infinite`` and ``go ponder`` hold ``bestmove`` back until ``stop``.
+    """
+
+    def __init__(self, pool: EnginePool, output=sys.stdout):
+        self.pool = pool
+        self.output = output
+        self.fen = START_FEN
+        self.moves: list[str] = []
+        self.mode = settings.AI_MODE
+        self.searcher = None
+        self.thread = None
+        self.stopped = threading.Event()
+        self.lock = threading.Lock()
+
+    def send(self, line: str):
+        with self.lock:
+            self.output.write(line + '\n')
+            self.output.flush()
+
+    def run(self, input=sys.stdin):
+        for line in input:
+            if not self.handle(line.split()):
+                break
+        self.stop()
+
+    def handle(self, tokens: list[str]) -> bool:
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+        if command == 'uci':
+            self.send('id name chess-ai')
+            self.send('id author brestok-1')
+            self.send(f"option name Mode type combo default {self.mode} var policy var search")
+            self.send('uciok')
+        elif command == 'isready':
+            self.send('readyok')
+        elif command == 'setoption' and len(args) >= 4 and args[1].lower() == 'mode':
+            self.mode = args[3]
+        elif command == 'ucinewgame':
+            self.stop()
+            self.fen, self.moves = START_FEN, []
+        elif command == 'position':
+            self.position(args)
+        elif command == 'go':
+            self.stop()
+            self.go(args)
+        elif command == 'stop':
+            self.stop()
+        elif command == 'quit':
+            return False
+        return True
+
+    def position(self, args: list[str]):
+        moves_at = args.index('moves') if 'moves' in args else len(args)
+        if args and args[0] == 'fen':
+            self.fen = ' '.join(args[1:moves_at])
+        else:
+            self.fen = START_FEN
+        self.moves = args[moves_at + 1:]
+
+    def go(self, args: list[str]):
+        limits, tokens = {}, iter(args)
+        for token in tokens:
+            limits[token] = True if token in ('infinite', 'ponder') else next(tokens, '0')
+        self.stopped = threading.Event()
+        if self.mode == 'search':
+            try:
+                with self.pool.engine(self.fen, self.moves) as engine:
+                    position = engine.detached_position()
+                    white = engine.turn == 'white'
+                self.searcher = Searcher(position, time_limit=self.time_limit(limits, white),
+                                         node_limit=int(limits.get('nodes', 0)),
+                                         max_depth=int(limits['depth']) if 'depth' in limits else None,
+                                         on_iteration=self.report)
+            except ValueError as error:
+                self.send(f"info string error {error}")
+                self.send('bestmove 0000')
+                return
+        self.thread = threading.Thread(target=self.think, name='uci-go', daemon=True,
+                                       args=(self.searcher, self.fen, self.moves, limits, self.stopped))
+        self.thread.start()
+
+    def think(self, searcher: Searcher | None, fen: str, moves: list[str], limits: dict, stopped: threading.Event):
+        if searcher is not None:
+            bestmove = searcher.search().uci
+        else:
+            try:
+                policy = self.pool.analyse(fen, moves, top_k=3)
+            except ValueError as error:
+                self.send(f"info string error {error}")
+                policy = {'bestmove': None, 'policy': []}
+            info = ' '.join(f"{entry['move']}:{entry['probability']:.3f}" for entry in policy['policy'])
+            self.send(f"info string policy {info}")
+            bestmove = policy['bestmove']
+        # A search may finish early (mate, depth cap) but UCI wants bestmove only after stop here.
+        if 'infinite' in limits or 'ponder' in limits:
+            stopped.wait()
+        self.send(f"bestmove {bestmove or '0000'}")
+
+    @staticmethod
+    def time_limit(limits: dict, white: bool) -> float | None:
+        """Seconds for this move; 0 means no deadline (``infinite``, or only depth/node limits)."""
+        if 'movetime' in limits:
+            return int(limits['movetime']) / 1000
+        if 'infinite' in limits or 'depth' in limits or 'nodes' in limits:
+            return 0
+        remaining = limits.get('wtime' if white else 'btime')
+        if remaining is None:
+            return None
+        increment = int(limits.get('winc' if white else 'binc', 0))
+        return (int(remaining) / int(limits.get('movestogo', 30)) + increment * 0.8) / 1000
+
+    def report(self, result: SearchResult):
+        if abs(result.score) >= MATE_BOUND:
+            plies = MATE - abs(result.score)
+            score = f"mate {(plies + 1) // 2 if result.score > 0 else -((plies + 1) // 2)}"
+        else:
+            score = f"cp {result.score}"
+        self.send(f"info depth {result.depth} score {score} nodes {result.nodes} nps {result.nps} "
+                  f"time {int(result.elapsed * 1000)} pv {' '.join(result.pv)}")
+
+    def stop(self):
+        self.stopped.set()
+        if self.searcher is not None:
+            self.searcher.stop()
+        if self.thread is not None:
+            self.thread.join()
+        self.searcher = self.thread = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the model over UCI (stdin/stdout) and/or HTTP/JSON.")
+    parser.add_argument('--http', type=int, metavar='PORT', help="also serve POST /move on this port")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--engines', type=int, default=8, help="engine instances in the pool")
+    parser.add_argument('--no-uci', action='store_true', help="HTTP only; don't read UCI from stdin")
+    args = parser.parse_args()
+
+    engine_pool = EnginePool(args.engines)
+    if args.http:
+        http_server = serve_http(engine_pool, args.host, args.http)
+        print(f"serving http://{args.host}:{args.http}/move", file=sys.stderr)
+    if args.no_uci:
+        threading.Event().wait()
+    else:
+        UciSession(engine_pool).run()
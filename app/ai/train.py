@@ -0,0 +1,137 @@
+import argparse
+import glob
+import os
+import pathlib
+import time
+
+import numpy as np
+import torch
+import torch.nn as nn
+from torch.utils.data import BatchSampler, DataLoader, Dataset, RandomSampler
+
+from app.ai.dataset import LABELS_SUFFIX, PLANES_SUFFIX, load_vocabulary
+from app.core.model import ChessModel
+
+
+class ShardDataset(Dataset):
+    """Samples from the ``.npy`` shards written by ``app.ai.dataset``, read through memory maps.
+
+    Indexed by a list of sample indices so a whole batch is gathered with one
+    fancy-indexing read per shard. The memory maps are opened lazily, so each
+    ``DataLoader`` worker maps the files itself instead of receiving copies.
+    """
+
+    def __init__(self, shard_dir: str):
+        self.plane_paths = sorted(glob.glob(os.path.join(shard_dir, f'*-{PLANES_SUFFIX}.npy')))
+        if not self.plane_paths:
+            raise FileNotFoundError(f"no *-{PLANES_SUFFIX}.npy shards in {shard_dir}")
+        self.label_paths = [path[:-len(PLANES_SUFFIX) - 4] + f'{LABELS_SUFFIX}.npy' for path in self.plane_paths]
+        sizes = [len(np.load(path, mmap_mode='r')) for path in self.label_paths]
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)])
+        self.shards = None
+
+    def __len__(self) -> int:
+        return int(self.offsets[-1])
+
+    def __getitem__(self, indices: list[int]) -> tuple[torch.Tensor, torch.Tensor]:
+        if self.shards is None:
+            self.shards = [(np.load(planes, mmap_mode='r'), np.load(labels, mmap_mode='r'))
+                           for planes, labels in zip(self.plane_paths, self.label_paths)]
+        indices = np.sort(np.asarray(indices))
+        shard_ids = np.searchsorted(self.offsets, indices, side='right') - 1
+        planes = np.empty((len(indices), 13, 8, 8), dtype=np.uint8)
+        labels = np.empty(len(indices), dtype=np.int64)
+        for shard_id in np.unique(shard_ids):
+            mask = shard_ids == shard_id
+            local = indices[mask] - self.offsets[shard_id]
+            shard_planes, shard_labels = self.shards[shard_id]
+            planes[mask] = shard_planes[local]
+            labels[mask] = shard_labels[local]
+        return torch.from_numpy(planes), torch.from_numpy(labels)
+
+
+def save_checkpoint(path: pathlib.Path, model: nn.Module, optimizer, epoch: int, step: int):
+    """Write the bare ``state_dict`` (what ``BaseConfig`` loads) plus a ``.state`` file to resume from."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    torch.save(model.state_dict(), path)
+    torch.save({'optimizer': optimizer.state_dict(), 'epoch': epoch, 'step': step}, f'{path}.state')
+
+
+def train(shard_dir: str, output: str, epochs: int = 10, batch_size: int = 1024, lr: float = 1e-4,
+          workers: int = 2, threads: int | None = None, bf16: bool = False, pin_memory: bool | None = None,
+          checkpoint_every: int = 1000, resume: bool = False, vocabulary_path: str | None = None):
+    if threads:
+        torch.set_num_threads(threads)
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    if pin_memory is None:
+        pin_memory = device.type == 'cuda'
+
+    dataset = ShardDataset(shard_dir)
+    # The dataset takes whole batches of indices, so the loader must not batch again.
+    loader = DataLoader(dataset, batch_size=None, num_workers=workers, pin_memory=pin_memory,
+                        persistent_workers=workers > 0, prefetch_factor=4 if workers > 0 else None,
+                        sampler=BatchSampler(RandomSampler(dataset), batch_size, drop_last=False))
+
+    model = ChessModel(num_classes=len(load_vocabulary(vocabulary_path))).to(device)
+    optimizer = torch.optim.Adam(model.parameters(), lr=lr)
+    criterion = nn.CrossEntropyLoss()
+    output = pathlib.Path(output)
+    start_epoch, step = 0, 0
+    if resume and output.exists():
+        model.load_state_dict(torch.load(output, map_location=device))
+        state = torch.load(f'{output}.state', map_location=device)
+        optimizer.load_state_dict(state['optimizer'])
+        start_epoch, step = state['epoch'], state['step']
+        print(f"resumed from {output} at epoch {start_epoch + 1}, step {step}")
+
+    for epoch in range(start_epoch, epochs):
+        model.train()
+        samples, loss_sum, correct = 0, 0.0, 0
+        started = time.perf_counter()
+        for planes, labels in loader:
+            planes = planes.to(device, non_blocking=pin_memory).float()
+            labels = labels.to(device, non_blocking=pin_memory)
+            optimizer.zero_grad(set_to_none=True)
+            with torch.autocast(device.type, dtype=torch.bfloat16, enabled=bf16):
+                logits = model(planes)
+                loss = criterion(logits.float(), labels)
+            loss.backward()
+            optimizer.step()
+
+            step += 1
+            samples += len(labels)
+            loss_sum += loss.item() * len(labels)
+            correct += (logits.argmax(1) == labels).sum().item()
+            if checkpoint_every and step % checkpoint_every == 0:
+                save_checkpoint(output, model, optimizer, epoch, step)
+                elapsed = time.perf_counter() - started
+                print(f"epoch {epoch + 1} step {step}: loss={loss_sum / samples:.4f} "
+                      f"samples/sec={samples / elapsed:.0f}")
+
+        elapsed = time.perf_counter() - started
+        save_checkpoint(output, model, optimizer, epoch + 1, step)
+        print(f"epoch {epoch + 1}/{epochs}: loss={loss_sum / max(samples, 1):.4f} "
+              f"accuracy={correct / max(samples, 1):.3f} samples={samples} time={elapsed:.1f}s "
+              f"samples/sec={samples / elapsed if elapsed else 0:.0f}")
+    return model
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train ChessModel on shards built by app.ai.dataset.")
+    parser.add_argument('shards', help="directory of *-positions.npy / *-labels.npy shards")
+    parser.add_argument('--output', required=True,
+                        help="checkpoint path; the file is a state_dict BaseConfig can load")
+    parser.add_argument('--epochs', type=int, default=10)
+    parser.add_argument('--batch-size', type=int, default=1024)
+    parser.add_argument('--lr', type=float, default=1e-4)
+    parser.add_argument('--workers', type=int, default=2, help="DataLoader worker processes")
+    parser.add_argument('--threads', type=int, help="torch.set_num_threads for the training process")
+    parser.add_argument('--bf16', action='store_true', help="bfloat16 autocast for the forward pass")
+    parser.add_argument('--pin-memory', action=argparse.BooleanOptionalAction, default=None,
+                        help="pin batches in page-locked memory; on by default when CUDA is present")
+    parser.add_argument('--checkpoint-every', type=int, default=1000, help="steps between checkpoints")
+    parser.add_argument('--resume', action='store_true', help="continue from --output and its .state file")
+    parser.add_argument('--vocabulary', help="vocabulary .npy or pickled move_to_int; the model's by default")
+    args = parser.parse_args()
+    train(args.shards, args.output, args.epochs, args.batch_size, args.lr, args.workers, args.threads,
+          args.bf16, args.pin_memory, args.checkpoint_every, args.resume, args.vocabulary)
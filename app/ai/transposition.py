@@ -0,0 +1,90 @@
+EXACT, LOWER, UPPER = 1, 2, 3
+
+ENTRY_BYTES = 16
+BUCKET_SIZE = 2
+MAX_GENERATION = 63
+
+
+class TranspositionTable:
+    """Fixed-size hash table of search results keyed by ``Bitboard.key``.
+
+    Entries are two 64-bit words: the packed data (move, score, depth, bound,
+    generation) and the key XOR-ed with that data, so torn writes from concurrent
+    writers fail verification instead of returning garbage. Slots are grouped in
+    buckets of two; a store replaces the entry for the same key, otherwise the
+    entry from the oldest search and then the shallowest one.
+
+    ``buffer`` lets the table live in memory owned by someone else (for example a
+    ``multiprocessing.shared_memory`` block); otherwise ``size_bytes`` is allocated.
+    """
+
+    def __init__(self, size_bytes: int = 64 * 1024 * 1024, buffer=None):
+        if buffer is None:
+            buffer = bytearray(size_bytes)
+        self.buckets = max(1, len(buffer) // (ENTRY_BYTES * BUCKET_SIZE))
+        self.buffer = buffer
+        self.table = memoryview(buffer)[:self.buckets * ENTRY_BYTES * BUCKET_SIZE].cast('Q')
+        self.generation = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self.buckets * ENTRY_BYTES * BUCKET_SIZE
+
+    def new_search(self):
+        self.generation = (self.generation + 1) & MAX_GENERATION
+
+    def release(self):
+        """Drop the view on ``buffer`` so a shared memory block can be closed."""
+        self.table.release()
+
+    def clear(self):
+        memoryview(self.buffer)[:self.size_bytes] = bytes(self.size_bytes)
+        self.generation = 0
+
+    def probe(self, key: int) -> tuple[int, int, int, int] | None:
+        """Return ``(move, score, depth, bound)`` stored for ``key``, if any."""
+        table = self.table
+        index = (key % self.buckets) * BUCKET_SIZE * 2
+        for slot in range(index, index + BUCKET_SIZE * 2, 2):
+            data = table[slot + 1]
+            if data and table[slot] ^ data == key:
+                return (data & 0xFFFF, ((data >> 16) & 0xFFFF) - 32768,
+                        (data >> 32) & 0xFF, (data >> 40) & 3)
+        return None
+
+    def store(self, key: int, move: int, score: int, depth: int, bound: int):
+        table = self.table
+        generation = self.generation
+        index = (key % self.buckets) * BUCKET_SIZE * 2
+        victim, victim_worth = index, None
+        for slot in range(index, index + BUCKET_SIZE * 2, 2):
+            data = table[slot + 1]
+            if not data:
+                victim = slot
+                break
+            if table[slot] ^ data == key:
+                if not move:
+                    move = data & 0xFFFF
+                victim = slot
+                break
+            age = (generation - (data >> 42)) & MAX_GENERATION
+            worth = ((data >> 32) & 0xFF) - 8 * age
+            if victim_worth is None or worth < victim_worth:
+                victim, victim_worth = slot, worth
+
+        score = max(-32767, min(32767, score))
+        data = (move & 0xFFFF) | ((score + 32768) << 16) | (min(depth, 255) << 32) | (bound << 40) \
+            | (generation << 42)
+        table[victim] = key ^ data
+        table[victim + 1] = data
+
+    def hashfull(self) -> int:
+        """Permille of a sample of slots written during the current search."""
+        table = self.table
+        sample = min(1000, self.buckets * BUCKET_SIZE)
+        used = 0
+        for slot in range(0, sample * 2, 2):
+            data = table[slot + 1]
+            if data and (data >> 42) == self.generation:
+                used += 1
+        return used * 1000 // sample
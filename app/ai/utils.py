@@ -1,27 +1,48 @@
+from itertools import islice
+
 import numpy as np
 from chess import Board
 
-from app.chess.piece import ChessPiece
+PLANES = 13
+
+
+def bitboards_to_planes(masks: list[int], out: np.ndarray) -> np.ndarray:
+    """Unpack 64-bit square masks (a1 = bit 0) into ``out[plane, rank, file]``.
+
+    ``out`` must be C-contiguous, e.g. a fresh array or one row of a batch buffer.
+    """
+    bits = np.unpackbits(np.array(masks, dtype='<u8').view(np.uint8), bitorder='little')
+    out.reshape(len(masks), 64)[...] = bits.reshape(len(masks), 64)
+    return out
+
 
-def board_to_matrix(chess):
-    matrix = np.zeros((13, 8, 8))
-    for x in range(8):
-        for y in range(8):
-            piece: ChessPiece = chess.board[x][y]
-            if piece is not None:
-                piece_color = 0 if piece.color == 'white' else 6
-                piece_type = piece.piece_type
-                row = 7 - y
-                matrix[piece_type + piece_color, row, x] = 1
+def board_to_matrix(chess, out: np.ndarray | None = None, moves=None) -> np.ndarray:
+    """Encode a position as 12 piece planes plus a plane of legal destination squares.
 
-    legal_moves = chess.get_legal_moves()
-    for (_, _), (to_x, to_y) in legal_moves:
-        row_to = 7 - to_y
-        matrix[12, row_to, to_x] = 1
-    return matrix
+    Accepts a ``Chess`` game or a ``chess.Board`` and writes into ``out`` (float32,
+    shape ``(13, 8, 8)``) when given, so batches can be filled in place. Callers
+    that already hold the packed legal ``moves`` pass them in; otherwise they are
+    generated into the bitboard's own move buffer.
+    """
+    if out is None:
+        out = np.empty((PLANES, 8, 8), dtype=np.float32)
+    destinations = 0
+    if isinstance(chess, Board):
+        masks = [chess.pieces_mask(piece_type, color) for color in (True, False) for piece_type in range(1, 7)]
+        for move in chess.legal_moves:
+            destinations |= 1 << move.to_square
+    else:
+        bitboard = chess.bitboard
+        masks = bitboard.pieces[0] + bitboard.pieces[1]
+        if moves is None:
+            moves = islice(bitboard.move_buffer, bitboard.generate_moves(bitboard.move_buffer))
+        for move in moves:
+            destinations |= 1 << ((move >> 6) & 63)
+    masks.append(destinations)
+    return bitboards_to_planes(masks, out)
 
 
 if __name__ == "__main__":
     board_ = Board()
     t = board_to_matrix(board_)
-    print(t)
\ No newline at end of file
+    print(t)
@@ -0,0 +1,614 @@
+from array import array
+
+from app.chess.zobrist import PIECE_KEYS, TURN_KEY, CASTLING_KEYS, EP_FILE_KEYS
+
+WHITE, BLACK = 0, 1
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+
+COLOR_NAMES = ('white', 'black')
+COLOR_INDEX = {'white': WHITE, 'black': BLACK}
+
+# Squares are numbered a1 = 0 ... h8 = 63. The GUI board uses (x, y) with y = 0 on rank 8.
+FILE_A = 0x0101010101010101
+FILE_H = FILE_A << 7
+RANK_1 = 0xFF
+RANK_2 = RANK_1 << 8
+RANK_7 = RANK_1 << 48
+RANK_8 = RANK_1 << 56
+FULL_BOARD = (1 << 64) - 1
+
+# Castling rights
+WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE = 1, 2, 4, 8
+ALL_CASTLING = 15
+
+# Moves are packed into 16 bits: from square, to square and a 4-bit flag field.
+CASTLE = 1
+EN_PASSANT = 2
+PROMOTION = 8  # the low three bits carry the promoted piece type
+PROMOTION_TYPES = (QUEEN, ROOK, BISHOP, KNIGHT)
+PIECE_LETTERS = 'pnbrqk'
+# No legal position has more than 218 moves.
+MAX_MOVES = 256
+
+
+def square_index(x: int, y: int) -> int:
+    return (7 - y) * 8 + x
+
+
+def square_coords(square: int) -> tuple[int, int]:
+    return square & 7, 7 - (square >> 3)
+
+
+def encode_move(from_square: int, to_square: int, flags: int = 0) -> int:
+    return from_square | (to_square << 6) | (flags << 12)
+
+
+def decode_move(move: int) -> tuple[int, int, int]:
+    return move & 63, (move >> 6) & 63, move >> 12
+
+
+def move_to_uci(move: int) -> str:
+    from_square, to_square, flags = move & 63, (move >> 6) & 63, move >> 12
+    uci = (chr(ord('a') + (from_square & 7)) + str((from_square >> 3) + 1)
+           + chr(ord('a') + (to_square & 7)) + str((to_square >> 3) + 1))
+    if flags & PROMOTION:
+        uci += PIECE_LETTERS[flags & 7]
+    return uci
+
+
+def new_move_buffer() -> array:
+    """A fixed-size ``array('H')`` that ``Bitboard.generate_moves`` fills in place."""
+    return array('H', bytes(2 * MAX_MOVES))
+
+
+def iter_bits(bb: int):
+    while bb:
+        lsb = bb & -bb
+        yield lsb.bit_length() - 1
+        bb ^= lsb
+
+
+def _step_table(deltas: tuple) -> list[int]:
+    table = []
+    for square in range(64):
+        file, rank = square & 7, square >> 3
+        bb = 0
+        for df, dr in deltas:
+            f, r = file + df, rank + dr
+            if 0 <= f < 8 and 0 <= r < 8:
+                bb |= 1 << (r * 8 + f)
+        table.append(bb)
+    return table
+
+
+def _ray_table(df: int, dr: int) -> list[int]:
+    table = []
+    for square in range(64):
+        f, r = (square & 7) + df, (square >> 3) + dr
+        bb = 0
+        while 0 <= f < 8 and 0 <= r < 8:
+            bb |= 1 << (r * 8 + f)
+            f, r = f + df, r + dr
+        table.append(bb)
+    return table
+
+
+KNIGHT_ATTACKS = _step_table(((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2)))
+KING_ATTACKS = _step_table(((0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1)))
+PAWN_ATTACKS = (_step_table(((-1, 1), (1, 1))), _step_table(((-1, -1), (1, -1))))
+
+# Rays that grow towards higher square indices are cut at their lowest blocker,
+# the others at their highest one.
+RAY_N, RAY_E, RAY_NE, RAY_NW = _ray_table(0, 1), _ray_table(1, 0), _ray_table(1, 1), _ray_table(-1, 1)
+RAY_S, RAY_W, RAY_SE, RAY_SW = _ray_table(0, -1), _ray_table(-1, 0), _ray_table(1, -1), _ray_table(-1, -1)
+
+
+def _between_table() -> list[list[int]]:
+    table = [[0] * 64 for _ in range(64)]
+    for square in range(64):
+        for df, dr in ((0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1)):
+            f, r = (square & 7) + df, (square >> 3) + dr
+            between = 0
+            while 0 <= f < 8 and 0 <= r < 8:
+                table[square][r * 8 + f] = between
+                between |= 1 << (r * 8 + f)
+                f, r = f + df, r + dr
+    return table
+
+
+# Squares strictly between two squares sharing a rank, file or diagonal (0 otherwise).
+BETWEEN = _between_table()
+
+
+def _castling_masks() -> list[int]:
+    masks = [ALL_CASTLING] * 64
+    masks[4] &= ~(WHITE_KINGSIDE | WHITE_QUEENSIDE)
+    masks[7] &= ~WHITE_KINGSIDE
+    masks[0] &= ~WHITE_QUEENSIDE
+    masks[60] &= ~(BLACK_KINGSIDE | BLACK_QUEENSIDE)
+    masks[63] &= ~BLACK_KINGSIDE
+    masks[56] &= ~BLACK_QUEENSIDE
+    return masks
+
+
+# Rights that survive a move touching a square (as origin or destination).
+CASTLING_MASKS = _castling_masks()
+# Each castling right with the home squares of its king and rook.
+CASTLING_HOMES = ((WHITE_KINGSIDE, 4, 7), (WHITE_QUEENSIDE, 4, 0), (BLACK_KINGSIDE, 60, 63), (BLACK_QUEENSIDE, 60, 56))
+
+
+def _slide(square: int, occupied: int, positive: tuple, negative: tuple) -> int:
+    attacks = 0
+    for ray in positive:
+        bb = ray[square]
+        blockers = bb & occupied
+        if blockers:
+            bb ^= ray[(blockers & -blockers).bit_length() - 1]
+        attacks |= bb
+    for ray in negative:
+        bb = ray[square]
+        blockers = bb & occupied
+        if blockers:
+            bb ^= ray[blockers.bit_length() - 1]
+        attacks |= bb
+    return attacks
+
+
+def bishop_attacks(square: int, occupied: int) -> int:
+    return _slide(square, occupied, (RAY_NE, RAY_NW), (RAY_SE, RAY_SW))
+
+
+def rook_attacks(square: int, occupied: int) -> int:
+    return _slide(square, occupied, (RAY_N, RAY_E), (RAY_S, RAY_W))
+
+
+def queen_attacks(square: int, occupied: int) -> int:
+    return _slide(square, occupied, (RAY_N, RAY_E, RAY_NE, RAY_NW), (RAY_S, RAY_W, RAY_SE, RAY_SW))
+
+
+class Bitboard:
+    """64-bit occupancy masks per color and piece type, plus a square -> piece mailbox.
+
+    Pieces are encoded as ``color * 6 + piece_type`` which is also the plane index
+    used by ``board_to_matrix``.
+
+    ``attacks`` holds the attack set of the piece on every square and ``attacked``
+    the per-color union of them. ``move_piece`` and ``replace_piece`` refresh only
+    the pieces whose attacks can change, so attack queries are a single bit test.
+
+    ``make_move``/``unmake_move`` push and pop one packed integer per ply on
+    ``history`` (move, captured piece, castling rights, en passant square and the
+    previous Zobrist ``key``), so a search can walk a tree on a single instance.
+    ``ep_square`` is only set when an enemy pawn can legally capture there.
+    """
+
+    def __init__(self):
+        self.pieces: list[list[int]] = [[0] * 6, [0] * 6]
+        self.occupancy: list[int] = [0, 0]
+        self.squares: list[int | None] = [None] * 64
+        self.attacks: list[int] = [0] * 64
+        self.attacked: list[int] = [0, 0]
+        self.turn = WHITE
+        self.castling = 0
+        self.ep_square: int | None = None
+        self.key = 0
+        self.history: list[int] = []
+        # Scratch space for legal_moves and friends, so they don't allocate a buffer per call.
+        self.move_buffer = new_move_buffer()
+
+    @classmethod
+    def from_board(cls, board: list, turn: int = WHITE) -> 'Bitboard':
+        bitboard = cls()
+        for x in range(8):
+            for y in range(8):
+                piece = board[x][y]
+                if piece is not None:
+                    bitboard.put_piece(square_index(x, y), COLOR_INDEX[piece.color], piece.piece_type)
+        bitboard.turn = turn
+        for right, king_square, rook_square in CASTLING_HOMES:
+            king = board[king_square & 7][7 - (king_square >> 3)]
+            rook = board[rook_square & 7][7 - (rook_square >> 3)]
+            if (king is not None and king.piece_type == KING and not king.has_moved
+                    and rook is not None and rook.piece_type == ROOK and not rook.has_moved
+                    and rook.color == king.color):
+                bitboard.castling |= right
+        bitboard.key = bitboard.compute_key()
+        bitboard.refresh_attacks()
+        return bitboard
+
+    @classmethod
+    def from_fen(cls, fen: str) -> 'Bitboard':
+        """Position from the first four FEN fields; move clocks are ignored here.
+
+        Like python-chess, a castling right whose king or rook is not on its
+        home square is dropped rather than rejected.
+        """
+        fields = fen.split()
+        if not fields:
+            raise ValueError("empty FEN")
+        placement, turn = fields[0], fields[1] if len(fields) > 1 else 'w'
+        castling = fields[2] if len(fields) > 2 else '-'
+        ep = fields[3] if len(fields) > 3 else '-'
+        ranks = placement.split('/')
+        if len(ranks) != 8:
+            raise ValueError(f"invalid FEN placement: {placement!r}")
+        bitboard = cls()
+        for row, rank in enumerate(ranks):
+            file = 0
+            for char in rank:
+                if char.isdigit():
+                    file += int(char)
+                    continue
+                piece_type = PIECE_LETTERS.find(char.lower())
+                if piece_type < 0 or file > 7:
+                    raise ValueError(f"invalid FEN placement: {placement!r}")
+                bitboard.put_piece((7 - row) * 8 + file, WHITE if char.isupper() else BLACK, piece_type)
+                file += 1
+            if file != 8:
+                raise ValueError(f"invalid FEN placement: {placement!r}")
+        if turn not in ('w', 'b'):
+            raise ValueError(f"invalid FEN side to move: {turn!r}")
+        bitboard.turn = WHITE if turn == 'w' else BLACK
+        for char in castling.replace('-', ''):
+            index = 'KQkq'.find(char)
+            if index < 0:
+                raise ValueError(f"invalid FEN castling rights: {castling!r}")
+            bitboard.castling |= 1 << index
+        for right, king_square, rook_square in CASTLING_HOMES:
+            color = WHITE if right in (WHITE_KINGSIDE, WHITE_QUEENSIDE) else BLACK
+            if (bitboard.squares[king_square] != color * 6 + KING
+                    or bitboard.squares[rook_square] != color * 6 + ROOK):
+                bitboard.castling &= ~right
+        if ep != '-':
+            if len(ep) != 2 or ep[0] not in 'abcdefgh' or ep[1] != ('6' if bitboard.turn == WHITE else '3'):
+                raise ValueError(f"invalid FEN en passant square: {ep!r}")
+            square = (ord(ep[0]) - ord('a')) + (int(ep[1]) - 1) * 8
+            # Same rule as make_move: only keep a square a pawn can legally capture on.
+            if bitboard.ep_capture_is_legal(square, bitboard.turn):
+                bitboard.ep_square = square
+        bitboard.key = bitboard.compute_key()
+        bitboard.refresh_attacks()
+        return bitboard
+
+    def fen(self) -> str:
+        """The first four FEN fields; ``ep_square`` is written only when a capture there is legal."""
+        ranks = []
+        for rank in range(7, -1, -1):
+            row, empty = '', 0
+            for file in range(8):
+                code = self.squares[rank * 8 + file]
+                if code is None:
+                    empty += 1
+                    continue
+                if empty:
+                    row, empty = row + str(empty), 0
+                letter = PIECE_LETTERS[code % 6]
+                row += letter.upper() if code < 6 else letter
+            ranks.append(row + (str(empty) if empty else ''))
+        castling = ''.join(char for index, char in enumerate('KQkq') if self.castling >> index & 1) or '-'
+        ep = '-' if self.ep_square is None else 'abcdefgh'[self.ep_square & 7] + str((self.ep_square >> 3) + 1)
+        return f"{'/'.join(ranks)} {'w' if self.turn == WHITE else 'b'} {castling} {ep}"
+
+    @property
+    def occupied(self) -> int:
+        return self.occupancy[WHITE] | self.occupancy[BLACK]
+
+    def compute_key(self) -> int:
+        key = CASTLING_KEYS[self.castling]
+        for square, code in enumerate(self.squares):
+            if code is not None:
+                key ^= PIECE_KEYS[code][square]
+        if self.ep_square is not None:
+            key ^= EP_FILE_KEYS[self.ep_square & 7]
+        if self.turn == BLACK:
+            key ^= TURN_KEY
+        return key
+
+    def put_piece(self, square: int, color: int, piece_type: int):
+        bit = 1 << square
+        code = color * 6 + piece_type
+        self.pieces[color][piece_type] |= bit
+        self.occupancy[color] |= bit
+        self.squares[square] = code
+        self.key ^= PIECE_KEYS[code][square]
+
+    def remove_piece(self, square: int) -> int | None:
+        code = self.squares[square]
+        if code is not None:
+            color, piece_type = divmod(code, 6)
+            mask = ~(1 << square)
+            self.pieces[color][piece_type] &= mask
+            self.occupancy[color] &= mask
+            self.squares[square] = None
+            self.key ^= PIECE_KEYS[code][square]
+        return code
+
+    def make_move(self, move: int):
+        from_square, to_square, flags = move & 63, (move >> 6) & 63, move >> 12
+        changed = (1 << from_square) | (1 << to_square)
+        # Snapshot the state before remove_piece folds the capture into the key.
+        ep_square, castling, previous_key = self.ep_square, self.castling, self.key
+        if flags == EN_PASSANT:
+            captured = self.remove_piece(to_square ^ 8)
+            changed |= 1 << (to_square ^ 8)
+        else:
+            captured = self.remove_piece(to_square)
+        self.history.append(move | ((0 if captured is None else captured + 1) << 16) | (castling << 20)
+                            | ((0 if ep_square is None else ep_square + 1) << 24) | (previous_key << 31))
+
+        color, piece_type = divmod(self.remove_piece(from_square), 6)
+        if flags & PROMOTION:
+            piece_type = flags & 7
+        self.put_piece(to_square, color, piece_type)
+        if flags == CASTLE:
+            changed |= self._move_castling_rook(to_square)
+
+        key = self.key ^ TURN_KEY
+        if ep_square is not None:
+            key ^= EP_FILE_KEYS[ep_square & 7]
+        self.ep_square = None
+        if piece_type == PAWN and (from_square ^ to_square) == 16:
+            ep_square = (from_square + to_square) >> 1
+            if self.ep_capture_is_legal(ep_square, color ^ 1):
+                self.ep_square = ep_square
+                key ^= EP_FILE_KEYS[ep_square & 7]
+        self.castling = castling & CASTLING_MASKS[from_square] & CASTLING_MASKS[to_square]
+        self.key = key ^ CASTLING_KEYS[castling] ^ CASTLING_KEYS[self.castling]
+        self.turn ^= 1
+        self.update_attacks(changed)
+
+    def unmake_move(self) -> int:
+        record = self.history.pop()
+        move = record & 0xFFFF
+        from_square, to_square, flags = move & 63, (move >> 6) & 63, move >> 12
+        captured = (record >> 16) & 15
+        ep_square = (record >> 24) & 127
+        self.turn ^= 1
+        self.castling = (record >> 20) & 15
+        self.ep_square = ep_square - 1 if ep_square else None
+
+        color, piece_type = divmod(self.remove_piece(to_square), 6)
+        if flags & PROMOTION:
+            piece_type = PAWN
+        self.put_piece(from_square, color, piece_type)
+        changed = (1 << from_square) | (1 << to_square)
+        if captured:
+            captured_square = to_square ^ 8 if flags == EN_PASSANT else to_square
+            self.put_piece(captured_square, *divmod(captured - 1, 6))
+            changed |= 1 << captured_square
+        if flags == CASTLE:
+            changed |= self._move_castling_rook(to_square, undo=True)
+        self.key = record >> 31
+        self.update_attacks(changed)
+        return move
+
+    def _move_castling_rook(self, king_to: int, undo: bool = False) -> int:
+        rank = king_to & 56
+        if king_to & 7 == 6:
+            rook_from, rook_to = rank | 7, rank | 5
+        else:
+            rook_from, rook_to = rank, rank | 3
+        if undo:
+            rook_from, rook_to = rook_to, rook_from
+        color, piece_type = divmod(self.remove_piece(rook_from), 6)
+        self.put_piece(rook_to, color, piece_type)
+        return (1 << rook_from) | (1 << rook_to)
+
+    def replace_piece(self, square: int, color: int, piece_type: int):
+        self.remove_piece(square)
+        self.put_piece(square, color, piece_type)
+        self.update_attacks(1 << square)
+
+    def refresh_attacks(self):
+        occupied = self.occupied
+        for square in range(64):
+            self.attacks[square] = self.attacks_from(square, occupied)
+        self._union_attacks()
+
+    def update_attacks(self, changed: int):
+        """Recompute attacks after the contents of the ``changed`` squares were modified.
+
+        Besides the pieces standing on those squares, only sliders whose current
+        attack set touches one of them can have gained or lost squares.
+        """
+        attacks = self.attacks
+        occupied = self.occupied
+        white, black = self.pieces
+        sliders = (white[BISHOP] | white[ROOK] | white[QUEEN]
+                   | black[BISHOP] | black[ROOK] | black[QUEEN]) & ~changed
+        dirty = changed
+        for square in iter_bits(sliders):
+            if attacks[square] & changed:
+                dirty |= 1 << square
+        for square in iter_bits(dirty):
+            attacks[square] = self.attacks_from(square, occupied)
+        self._union_attacks()
+
+    def _union_attacks(self):
+        attacks = self.attacks
+        for color in (WHITE, BLACK):
+            attacked = 0
+            for square in iter_bits(self.occupancy[color]):
+                attacked |= attacks[square]
+            self.attacked[color] = attacked
+
+    def piece_at(self, square: int) -> int | None:
+        return self.squares[square]
+
+    def king_square(self, color: int) -> int | None:
+        king = self.pieces[color][KING]
+        return king.bit_length() - 1 if king else None
+
+    def attacks_from(self, square: int, occupied: int | None = None) -> int:
+        code = self.squares[square]
+        if code is None:
+            return 0
+        if occupied is None:
+            occupied = self.occupied
+        color, piece_type = divmod(code, 6)
+        if piece_type == PAWN:
+            return PAWN_ATTACKS[color][square]
+        if piece_type == KNIGHT:
+            return KNIGHT_ATTACKS[square]
+        if piece_type == BISHOP:
+            return bishop_attacks(square, occupied)
+        if piece_type == ROOK:
+            return rook_attacks(square, occupied)
+        if piece_type == QUEEN:
+            return queen_attacks(square, occupied)
+        return KING_ATTACKS[square]
+
+    def attackers_to(self, square: int, by_color: int, occupied: int | None = None) -> int:
+        if occupied is None:
+            occupied = self.occupied
+        pieces = self.pieces[by_color]
+        queens = pieces[QUEEN]
+        return ((PAWN_ATTACKS[by_color ^ 1][square] & pieces[PAWN])
+                | (KNIGHT_ATTACKS[square] & pieces[KNIGHT])
+                | (KING_ATTACKS[square] & pieces[KING])
+                | (bishop_attacks(square, occupied) & (pieces[BISHOP] | queens))
+                | (rook_attacks(square, occupied) & (pieces[ROOK] | queens)))
+
+    def ep_capture_is_legal(self, ep_square: int, color: int) -> bool:
+        """Whether a ``color`` pawn may capture en passant on ``ep_square``, pins and checks included."""
+        pawns = PAWN_ATTACKS[color ^ 1][ep_square] & self.pieces[color][PAWN]
+        king = self.pieces[color][KING]
+        if not pawns or not king:
+            return bool(pawns)
+        king = king.bit_length() - 1
+        captured_square = ep_square ^ 8
+        occupied = self.occupied
+        for from_square in iter_bits(pawns):
+            after = (occupied ^ (1 << from_square) ^ (1 << captured_square)) | (1 << ep_square)
+            if not self.attackers_to(king, color ^ 1, after) & ~(1 << captured_square):
+                return True
+        return False
+
+    def is_attacked(self, square: int, by_color: int) -> bool:
+        return (self.attacked[by_color] >> square) & 1 == 1
+
+    def legal_moves(self) -> list[int]:
+        """Strictly legal packed moves for the side to move, as a new list."""
+        buffer = self.move_buffer
+        return buffer[:self.generate_moves(buffer)].tolist()
+
+    def has_legal_moves(self, buffer: array | None = None) -> bool:
+        return self.generate_moves(buffer if buffer is not None else self.move_buffer) > 0
+
+    def generate_moves(self, moves: array) -> int:
+        """Write the strictly legal packed moves into ``moves`` and return how many there are.
+
+        ``moves`` is a ``new_move_buffer()`` reused across calls, so generation
+        allocates no list. Checkers and pinned pieces are worked out once up
+        front, so every generated move is legal without playing it. Promotions
+        yield one move per piece type.
+        """
+        us, them = self.turn, self.turn ^ 1
+        pieces, enemy_pieces = self.pieces[us], self.pieces[them]
+        own, enemy = self.occupancy[us], self.occupancy[them]
+        occupied = own | enemy
+        count = 0
+        if not pieces[KING]:
+            return count
+        king = pieces[KING].bit_length() - 1
+
+        without_king = occupied ^ (1 << king)
+        for to_square in iter_bits(KING_ATTACKS[king] & ~own):
+            if not self.attackers_to(to_square, them, without_king):
+                moves[count] = king | (to_square << 6)
+                count += 1
+
+        checkers = self.attackers_to(king, them, occupied)
+        if checkers & (checkers - 1):
+            return count
+        if checkers:
+            targets = checkers | BETWEEN[king][checkers.bit_length() - 1]
+        else:
+            targets = ~own & FULL_BOARD
+            count = self._castling_moves(moves, count, king, occupied)
+
+        pinned = 0
+        pin_rays = {}
+        snipers = ((rook_attacks(king, enemy) & (enemy_pieces[ROOK] | enemy_pieces[QUEEN]))
+                   | (bishop_attacks(king, enemy) & (enemy_pieces[BISHOP] | enemy_pieces[QUEEN])))
+        for sniper in iter_bits(snipers):
+            between = BETWEEN[king][sniper]
+            blockers = between & occupied
+            if blockers & own and not blockers & (blockers - 1):
+                pinned |= blockers
+                pin_rays[blockers.bit_length() - 1] = between | (1 << sniper)
+
+        for from_square in iter_bits(pieces[KNIGHT] & ~pinned):
+            for to_square in iter_bits(KNIGHT_ATTACKS[from_square] & targets):
+                moves[count] = from_square | (to_square << 6)
+                count += 1
+        for piece_type, attacks in ((BISHOP, bishop_attacks), (ROOK, rook_attacks), (QUEEN, queen_attacks)):
+            for from_square in iter_bits(pieces[piece_type]):
+                destinations = attacks(from_square, occupied) & targets
+                if (pinned >> from_square) & 1:
+                    destinations &= pin_rays[from_square]
+                for to_square in iter_bits(destinations):
+                    moves[count] = from_square | (to_square << 6)
+                    count += 1
+
+        return self._pawn_moves(moves, count, king, occupied, targets, pinned, pin_rays)
+
+    def _castling_moves(self, moves: array, count: int, king: int, occupied: int) -> int:
+        rights = self.castling >> (2 * self.turn)
+        attacked = self.attacked[self.turn ^ 1]
+        rank = king & 56
+        if rights & 1 and not occupied & (0x60 << rank) and not attacked & (0x60 << rank):
+            moves[count] = king | ((king + 2) << 6) | (CASTLE << 12)
+            count += 1
+        if rights & 2 and not occupied & (0x0E << rank) and not attacked & (0x0C << rank):
+            moves[count] = king | ((king - 2) << 6) | (CASTLE << 12)
+            count += 1
+        return count
+
+    def _pawn_moves(self, moves: array, count: int, king: int, occupied: int, targets: int, pinned: int,
+                    pin_rays: dict) -> int:
+        us, them = self.turn, self.turn ^ 1
+        enemy = self.occupancy[them]
+        if us == WHITE:
+            push, start_rank, last_rank = 8, RANK_2, RANK_8
+        else:
+            push, start_rank, last_rank = -8, RANK_7, RANK_1
+        pawn_attacks = PAWN_ATTACKS[us]
+        ep_square = self.ep_square
+
+        for from_square in iter_bits(self.pieces[us][PAWN]):
+            allowed = targets
+            if (pinned >> from_square) & 1:
+                allowed &= pin_rays[from_square]
+
+            destinations = pawn_attacks[from_square] & enemy
+            to_square = from_square + push
+            if not (occupied >> to_square) & 1:
+                destinations |= 1 << to_square
+                if (start_rank >> from_square) & 1 and not (occupied >> (to_square + push)) & 1:
+                    destinations |= 1 << (to_square + push)
+
+            for to_square in iter_bits(destinations & allowed):
+                move = from_square | (to_square << 6)
+                if (last_rank >> to_square) & 1:
+                    for piece_type in PROMOTION_TYPES:
+                        moves[count] = move | ((PROMOTION | piece_type) << 12)
+                        count += 1
+                else:
+                    moves[count] = move
+                    count += 1
+
+            if ep_square is not None and (pawn_attacks[from_square] >> ep_square) & 1:
+                captured_square = ep_square ^ 8
+                after = (occupied ^ (1 << from_square) ^ (1 << captured_square)) | (1 << ep_square)
+                if not self.attackers_to(king, them, after) & ~(1 << captured_square):
+                    moves[count] = from_square | (ep_square << 6) | (EN_PASSANT << 12)
+                    count += 1
+        return count
+
+    def parse_uci(self, uci: str) -> int | None:
+        moves = self.move_buffer
+        for index in range(self.generate_moves(moves)):
+            if move_to_uci(moves[index]) == uci:
+                return moves[index]
+        return None
@@ -0,0 +1,355 @@
+import copy
+from typing import TYPE_CHECKING
+
+from app.chess.bitboard import (Bitboard, COLOR_INDEX, COLOR_NAMES, CASTLE, EN_PASSANT, PROMOTION, WHITE, PAWN,
+                                ROOK, QUEEN, KING, square_index, square_coords, encode_move, decode_move,
+                                new_move_buffer, WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE)
+from app.chess.piece import Pawn, Knight, Queen, Bishop, Rook, King, ChessPiece, PIECE_CLASSES
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from app.ai.parallel import ParallelSearch
+    from app.ai.search import SearchPosition, Searcher
+
+# Castling right that a rook on its home square still carries.
+CASTLING_RIGHTS = {7: WHITE_KINGSIDE, 0: WHITE_QUEENSIDE, 63: BLACK_KINGSIDE, 56: BLACK_QUEENSIDE}
+
+
+class ChessEngine:
+    """Game state, rules and AI moves without any rendering or pygame dependency."""
+
+    def __init__(self):
+        self.board: list = [[None for _ in range(8)] for _ in range(8)]
+        self.bitboard = Bitboard()
+        self.move_buffer = new_move_buffer()
+        self.piece_history = []
+        self.winner = None
+        self.pawn_promotion = None
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        self.reset()
+
+    @classmethod
+    def from_fen(cls, fen: str) -> 'ChessEngine':
+        engine = cls()
+        engine.load_fen(fen)
+        return engine
+
+    @property
+    def turn(self) -> str:
+        return COLOR_NAMES[self.bitboard.turn]
+
+    @property
+    def key(self) -> int:
+        return self.bitboard.key
+
+    def reset(self):
+        self.winner = None
+        self.pawn_promotion = None
+        self.board: list = [[None for _ in range(8)] for _ in range(8)]
+        self.piece_history = []
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        self.initialize_board()
+
+    def load_fen(self, fen: str):
+        """Set up the position from FEN: placement, side to move, castling, en passant and both clocks.
+
+        Kings and rooks without a castling right and pawns off their start rank
+        count as moved, so the piece objects agree with the bitboard.
+        """
+        bitboard = Bitboard.from_fen(fen)
+        fields = fen.split()
+        if len(fields) > 6:
+            raise ValueError(f"invalid FEN: too many fields in {fen!r}")
+        # Validate everything before the engine is touched, so a bad FEN leaves it as it was.
+        clocks = fields[4:]
+        if not all(clock.isascii() and clock.isdigit() for clock in clocks):
+            raise ValueError(f"invalid FEN move clocks: {' '.join(clocks)!r}")
+        halfmove_clock, fullmove_number = [int(clock) for clock in clocks] + [0, 1][len(clocks):]
+        if fullmove_number < 1:
+            raise ValueError(f"invalid FEN fullmove number: {fullmove_number}")
+        self.winner = None
+        self.pawn_promotion = None
+        self.board: list = [[None for _ in range(8)] for _ in range(8)]
+        self.piece_history = []
+        for square, code in enumerate(bitboard.squares):
+            if code is None:
+                continue
+            color, piece_type = divmod(code, 6)
+            x, y = square_coords(square)
+            piece = PIECE_CLASSES[piece_type](COLOR_NAMES[color], (x, y))
+            if piece_type == PAWN:
+                piece.has_moved = y != (6 if color == WHITE else 1)
+            elif piece_type == KING:
+                piece.has_moved = not bitboard.castling >> (2 * color) & 3
+            elif piece_type == ROOK:
+                piece.has_moved = not bitboard.castling & CASTLING_RIGHTS.get(square, 0)
+            self.board[x][y] = piece
+        self.bitboard = bitboard
+        self.halfmove_clock = halfmove_clock
+        self.fullmove_number = fullmove_number
+        self.end_turn()
+
+    def fen(self) -> str:
+        return f"{self.bitboard.fen()} {self.halfmove_clock} {self.fullmove_number}"
+
+    def initialize_board(self):
+        for x in range(8):
+            self.board[x][6] = Pawn('white', (x, 6))
+            self.board[x][1] = Pawn('black', (x, 1))
+
+        back_row = [Rook, Knight, Bishop, Queen, King, Bishop, Knight, Rook]
+        for x, piece_class in enumerate(back_row):
+            self.board[x][7] = piece_class('white', (x, 7))
+            self.board[x][0] = piece_class('black', (x, 0))
+        self.bitboard = Bitboard.from_board(self.board)
+
+    def move_piece(self, piece: ChessPiece, x: int, y: int):
+        captured_piece = self.get_piece_at(x, y)
+        flags = 0
+        if isinstance(piece, Pawn):
+            if (piece.color == 'white' and y == 0) or (piece.color == 'black' and y == 7):
+                self.pawn_promotion = piece
+                flags = PROMOTION | QUEEN
+            elif piece.position[0] != x and captured_piece is None:
+                flags = EN_PASSANT
+
+        if isinstance(piece, King):
+            if abs(piece.position[0] - x) == 2:
+                flags = CASTLE
+        self.make_move(encode_move(square_index(*piece.position), square_index(x, y), flags))
+
+    def make_move(self, move: int):
+        """Play a packed move on the bitboard and the piece grid and pass the turn.
+
+        Unlike ``move_piece`` this has no side effects on ``winner`` or
+        ``pawn_promotion``; every call can be reverted with ``unmake_move``.
+        """
+        from_square, to_square, flags = decode_move(move)
+        (from_x, from_y), (to_x, to_y) = square_coords(from_square), square_coords(to_square)
+        piece = self.board[from_x][from_y]
+        if flags == EN_PASSANT:
+            captured_piece = self.board[to_x][from_y]
+            self.board[to_x][from_y] = None
+        else:
+            captured_piece = self.board[to_x][to_y]
+        self.piece_history.append((piece, captured_piece, piece.has_moved, self.halfmove_clock))
+        self.halfmove_clock = 0 if captured_piece or isinstance(piece, Pawn) else self.halfmove_clock + 1
+        if piece.color == 'black':
+            self.fullmove_number += 1
+        self.bitboard.make_move(move)
+
+        self.board[from_x][from_y] = None
+        if flags == CASTLE:
+            self.perform_castle(piece, to_x)
+        piece.move((to_x, to_y))
+        if flags & PROMOTION:
+            self.board[to_x][to_y] = PIECE_CLASSES[flags & 7](piece.color, (to_x, to_y))
+        else:
+            self.board[to_x][to_y] = piece
+
+    def unmake_move(self) -> int:
+        move = self.bitboard.unmake_move()
+        piece, captured_piece, has_moved, self.halfmove_clock = self.piece_history.pop()
+        if piece.color == 'black':
+            self.fullmove_number -= 1
+        from_square, to_square, flags = decode_move(move)
+        (from_x, from_y), (to_x, to_y) = square_coords(from_square), square_coords(to_square)
+
+        self.board[to_x][to_y] = None
+        if captured_piece:
+            self.board[captured_piece.position[0]][captured_piece.position[1]] = captured_piece
+        self.board[from_x][from_y] = piece
+        piece.position = (from_x, from_y)
+        piece.has_moved = has_moved
+        if flags == CASTLE:
+            rook_x, home_x = (5, 7) if to_x == 6 else (3, 0)
+            rook = self.board[rook_x][to_y]
+            self.board[rook_x][to_y] = None
+            self.board[home_x][to_y] = rook
+            rook.position = (home_x, to_y)
+            rook.has_moved = False
+        return move
+
+    def promote_pawn(self, piece_class: type[ChessPiece]):
+        pawn = self.pawn_promotion
+        x, y = pawn.position
+        promoted = piece_class(pawn.color, (x, y))
+        self.board[x][y] = promoted
+        self.bitboard.replace_piece(square_index(x, y), COLOR_INDEX[promoted.color], promoted.piece_type)
+        self.pawn_promotion = None
+        self.end_turn()
+
+    def end_turn(self):
+        # The provisional queen is still on the board until the player picks a piece.
+        if self.pawn_promotion:
+            return
+        if winner:=self.is_king_in_checkmate(self.turn):
+            self.winner = winner
+        elif not self.bitboard.has_legal_moves(self.move_buffer):
+            self.winner = 'draw'
+
+    def get_piece_at(self, x: int, y: int) -> ChessPiece | None:
+        if 0 <= x < 8 and 0 <= y < 8:
+            return self.board[x][y]
+        return None
+
+    def is_empty(self, x: int, y: int):
+        return self.get_piece_at(x, y) is None
+
+    def is_enemy_piece(self, color: str, x: int, y: int):
+        piece = self.get_piece_at(x, y)
+        return piece and piece.color != color
+
+    def filter_valid_moves(self, piece: ChessPiece, moves: list):
+        valid_moves = []
+        for x, y in moves:
+            if 0 <= x < 8 and 0 <= y < 8:
+                target_piece = self.get_piece_at(x, y)
+                if not target_piece or target_piece.color != piece.color:
+                    valid_moves.append((x, y))
+        return valid_moves
+
+    def get_straight_moves(self, piece: ChessPiece):
+        directions = ((-1, 0), (1, 0), (0, -1), (0, 1))
+        return self.get_moves_in_directions(piece, directions)
+
+    def get_diagonal_moves(self, piece: ChessPiece):
+        directions = ((-1, -1), (1, 1), (-1, 1), (1, -1))
+        return self.get_moves_in_directions(piece, directions)
+
+    def get_moves_in_directions(self, piece: ChessPiece, directions: tuple) -> list[tuple[int, int]]:
+        moves = []
+        x, y = piece.position
+        for dx, dy in directions:
+            nx, ny = x, y
+            while True:
+                nx += dx
+                ny += dy
+                if 0 <= nx < 8 and 0 <= ny < 8:
+                    target_piece = self.get_piece_at(nx, ny)
+                    if not target_piece:
+                        moves.append((nx, ny))
+                    elif target_piece.color != piece.color:
+                        moves.append((nx, ny))
+                        break
+                    else:
+                        break
+                else:
+                    break
+        return moves
+
+    def is_king_in_checkmate(self, color: str) -> str | None:
+        white_king, black_king = self.find_king('white'), self.find_king('black')
+        if not white_king:
+            return 'black'
+        if not black_king:
+            return 'white'
+        king = white_king if color == 'white' else black_king
+        if color == self.turn and self.is_position_attacked(king.position, color) \
+                and not self.bitboard.has_legal_moves(self.move_buffer):
+            return 'black' if color == 'white' else 'white'
+        return None
+
+    def is_position_attacked(self, position: tuple[int, int], color: str):
+        return self.bitboard.is_attacked(square_index(*position), COLOR_INDEX[color] ^ 1)
+
+    def find_king(self, color: str) -> King | None:
+        square = self.bitboard.king_square(COLOR_INDEX[color])
+        if square is None:
+            return None
+        x, y = square_coords(square)
+        return self.board[x][y]
+
+    def can_castle(self, color: str, side: str) -> bool:
+        king = self.find_king(color)
+        if king.has_moved:
+            return False
+
+        if side == 'king':
+            rook = self.get_piece_at(7, king.position[1])
+        else:
+            rook = self.get_piece_at(0, king.position[1])
+
+        if not isinstance(rook, Rook) or rook.color != color or rook.has_moved:
+            return False
+
+        start = min(king.position[0], rook.position[0]) + 1
+        end = max(king.position[0], rook.position[0])
+        for x in range(start, end):
+            if not self.is_empty(x, king.position[1]):
+                return False
+        return True
+
+    def perform_castle(self, piece: ChessPiece, x: int):
+        if x == 6:  # King-side castling
+            rook = self.get_piece_at(7, piece.position[1])
+            self.board[7][piece.position[1]] = None
+            self.board[5][piece.position[1]] = rook
+            rook.move((5, piece.position[1]))
+        elif x == 2:  # Queen-side castling
+            rook = self.get_piece_at(0, piece.position[1])
+            self.board[0][piece.position[1]] = None
+            self.board[3][piece.position[1]] = rook
+            rook.move((3, piece.position[1]))
+
+    def legal_moves(self) -> list[int]:
+        return self.bitboard.legal_moves()
+
+    def get_legal_moves(self) -> list[tuple]:
+        """Legal moves as ``(from_pos, to_pos)`` pairs; a promotion square is listed once."""
+        legal_moves = []
+        moves = self.move_buffer
+        for index in range(self.bitboard.generate_moves(moves)):
+            from_square, to_square, flags = decode_move(moves[index])
+            if flags & PROMOTION and flags != PROMOTION | QUEEN:
+                continue
+            legal_moves.append((square_coords(from_square), square_coords(to_square)))
+        return legal_moves
+
+    # The AI modules pull in torch, so they are imported on first use: rules-only
+    # callers never pay for them.
+    def detached_position(self) -> 'SearchPosition':
+        """A copy of the position the AI can think about on another thread while this game is drawn."""
+        from app.ai.search import SearchPosition
+
+        return SearchPosition(copy.deepcopy(self.bitboard))
+
+    def ai_searcher(self, position=None) -> 'Searcher | ParallelSearch | None':
+        """A stoppable search for ``AI_MODE='search'``, on one process or the worker pool; None otherwise."""
+        from app.ai.parallel import ParallelSearch, shared_searcher
+        from app.ai.search import Searcher
+
+        if settings.AI_MODE != 'search':
+            return None
+        if settings.SEARCH_WORKERS > 1:
+            return ParallelSearch(shared_searcher(), position or self)
+        return Searcher(position or self)
+
+    def choose_ai_move(self, position=None, searcher: 'Searcher | ParallelSearch | None' = None) -> int | None:
+        from app.ai.book import probe
+        from app.ai.parallel import parallel_search
+        from app.ai.prediction import predict_move
+        from app.ai.search import search
+
+        position = position or self
+        book_move = probe(position)
+        if book_move is not None:
+            return book_move
+        if searcher is not None:
+            return searcher.search().move
+        if settings.AI_MODE == 'search':
+            if settings.SEARCH_WORKERS > 1:
+                return parallel_search(position).move
+            return search(position).move
+        ai_move = predict_move(position)
+        return position.bitboard.parse_uci(ai_move) if ai_move else None
+
+    def make_ai_move(self, move: int | None = None):
+        if move is None:
+            move = self.choose_ai_move()
+        if move is None:
+            return
+        self.make_move(move)
+        self.end_turn()
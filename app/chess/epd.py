@@ -0,0 +1,98 @@
+import argparse
+import re
+import time
+from typing import Iterator
+
+from app.chess.bitboard import Bitboard
+
+_OPERATION = re.compile(r'\s*([A-Za-z]\w*)\s*((?:"[^"]*"|[^;"])*);')
+
+
+def parse_line(line: str) -> tuple[str, dict[str, str]] | None:
+    """Split an EPD or FEN line into a full six-field FEN and its EPD operations.
+
+    EPD has four position fields followed by ``opcode operand;`` pairs; the
+    ``hmvc`` and ``fmvn`` operations supply the clocks. A plain FEN line has no
+    operations. Blank lines and ``#`` comments give None.
+    """
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    fields = line.split(None, 4)
+    if len(fields) < 4:
+        raise ValueError(f"not an EPD/FEN line: {line!r}")
+    position = ' '.join(fields[:4])
+    rest = fields[4] if len(fields) > 4 else ''
+    clocks = rest.split()
+    if len(clocks) == 2 and all(clock.isdigit() for clock in clocks):
+        return f"{position} {rest}", {}
+    operations = {opcode: operand.strip().strip('"') for opcode, operand in _OPERATION.findall(rest)}
+    return f"{position} {operations.get('hmvc', 0)} {operations.get('fmvn', 1)}", operations
+
+
+def read_positions(path: str) -> Iterator[tuple[str, dict[str, str]]]:
+    """Yield ``(fen, operations)`` one line at a time, so files of any size stream."""
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            record = parse_line(line)
+            if record is not None:
+                yield record
+
+
+def chunks(items: Iterator, size: int) -> Iterator[list]:
+    """Lists of ``size`` consecutive items (the last one may be shorter), pulled lazily."""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def evaluate_file(path: str, batch_size: int = 64, limit: int | None = None, verbose: bool = False):
+    """Predict a move for every position in ``path`` through batched inference.
+
+    Positions are read lazily and only ``batch_size`` of them are alive at a
+    time. When a record carries a ``bm`` (best move, SAN) operation the
+    prediction is scored against it.
+    """
+    import chess
+
+    from app.ai.prediction import predict_moves_batch
+    from app.ai.search import SearchPosition
+
+    positions, scored, correct = 0, 0, 0
+    start = time.perf_counter()
+    for batch in chunks(read_positions(path), batch_size):
+        if limit is not None:
+            batch = batch[:max(0, limit - positions)]
+            if not batch:
+                break
+        moves = predict_moves_batch([SearchPosition(Bitboard.from_fen(fen)) for fen, _ in batch])
+        for (fen, operations), move in zip(batch, moves):
+            positions += 1
+            verdict = ''
+            if 'bm' in operations:
+                board = chess.Board(fen)
+                best = {board.parse_san(san).uci() for san in operations['bm'].split()}
+                scored += 1
+                correct += move in best
+                verdict = 'ok' if move in best else f"bm {operations['bm']}"
+            if verbose:
+                print(f"{operations.get('id', fen)}: {move} {verdict}")
+    elapsed = time.perf_counter() - start
+    print(f"positions={positions} time={elapsed:.2f}s positions/sec={positions / elapsed if elapsed else 0:.1f}")
+    if scored:
+        print(f"best move found: {correct}/{scored} ({100 * correct / scored:.1f}%)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream an EPD/FEN file through the model.")
+    parser.add_argument('path')
+    parser.add_argument('--batch', type=int, default=64)
+    parser.add_argument('--limit', type=int)
+    parser.add_argument('--verbose', action='store_true', help="print the predicted move for every position")
+    args = parser.parse_args()
+    evaluate_file(args.path, args.batch, args.limit, args.verbose)
@@ -1,10 +1,11 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import pygame
 
 from app.chess.chess import Chess
 from app.chess.piece import Queen, Rook, Bishop, Knight
-from app.chess.utils import Utils
+from app.chess.renderer import BoardRenderer, render_text
 from app.core.config import settings
 
 
@@ -16,9 +17,17 @@ class Game:
         pygame.display.set_caption("Chess")
         pygame.display.set_icon(pygame.image.load(settings.BASE_DIR / 'res' / 'chess_icon.png'))
         self.clock, self.menu_showed, self.running = pygame.time.Clock(), False, True
-
-        self.ai_thinking_start_time = None
-        self.ai_thinking_delay = 1000
+        # The page on screen and its clickable areas, rebuilt only when the page is drawn.
+        self.page = None
+        self.buttons: list[tuple[pygame.Rect, callable]] = []
+
+        # AI moves are computed on this thread so the loop keeps drawing and handling input.
+        self.ai_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='chess-ai')
+        self.ai_future = None
+        self.ai_searcher = None
+        self.ai_position = None
+        # Load the model while the menu is up rather than on the AI's first turn.
+        self.ai_executor.submit(getattr, settings, 'MODEL')
 
     def start_game(self):
         self.setup_board()
@@ -26,24 +35,48 @@ class Game:
         while self.running:
             self.handle_events()
             if not self.menu_showed:
-                self.menu()
+                dirty_rects = self.menu()
             else:
-                if self.chess.turn == 'black':
-                    if self.ai_thinking_start_time is None:
-                        self.ai_thinking_start_time = pygame.time.get_ticks()
-                    else:
-                        current_time = pygame.time.get_ticks()
-                        if current_time - self.ai_thinking_start_time >= self.ai_thinking_delay:
-                            self.chess.make_ai_move()
-                            self.ai_thinking_start_time = None
-                else:
-                    self.ai_thinking_start_time = None
-                self.display_game()
-            pygame.display.flip()
+                self.update_ai()
+                dirty_rects = self.display_game()
+            # Pages flip once when shown; the board only pushes the squares that changed.
+            if dirty_rects is None:
+                pygame.display.flip()
+            elif dirty_rects:
+                pygame.display.update(dirty_rects)
             pygame.event.pump()
             clock.tick(30)
+        self.cancel_ai_move()
+        self.ai_executor.shutdown()
         pygame.quit()
 
+    def update_ai(self):
+        """Start thinking when it's black's turn and play the move once the future is done."""
+        if self.ai_future is None:
+            if self.chess.turn == 'black' and not self.chess.winner and not self.chess.pawn_promotion:
+                position = self.chess.detached_position()
+                self.ai_position = (self.chess.key, len(self.chess.bitboard.history))
+                self.ai_searcher = self.chess.ai_searcher(position)
+                self.ai_future = self.ai_executor.submit(self.chess.choose_ai_move, position, self.ai_searcher)
+        elif self.ai_future.done():
+            future, self.ai_future, self.ai_searcher = self.ai_future, None, None
+            # A reset while thinking makes the result stale.
+            if self.ai_position == (self.chess.key, len(self.chess.bitboard.history)):
+                # Not make_ai_move: a None result would make it think again on this thread.
+                move = future.result()
+                if move is not None:
+                    self.chess.make_move(move)
+                self.chess.end_turn()
+
+    def stop_ai_thinking(self):
+        """Play the best move found so far; the search budget is SEARCH_TIME_MS otherwise."""
+        if self.ai_searcher is not None:
+            self.ai_searcher.stop()
+
+    def cancel_ai_move(self):
+        self.stop_ai_thinking()
+        self.ai_position = None
+
     def setup_board(self):
         self.board_offset_x, self.board_offset_y = 30, 80
         self.board_img = pygame.image.load(settings.BASE_DIR / 'res' / 'board.png').convert()
@@ -52,6 +85,7 @@ class Game:
             [self.board_offset_x + (x * square_len), self.board_offset_y + (y * square_len)]
             for y in range(8)] for x in range(8)]
         self.chess = Chess(self.screen, os.path.join(settings.BASE_DIR / 'res' / 'pieces.png'), self.board_locations, square_len)
+        self.renderer = BoardRenderer(self.screen, self.chess, self.board_img, (self.board_offset_x, self.board_offset_y))
 
     def handle_events(self):
         for event in pygame.event.get():
@@ -61,117 +95,93 @@ class Game:
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
                 elif event.key == pygame.K_SPACE:
+                    self.cancel_ai_move()
                     self.chess.reset()
+                elif event.key == pygame.K_RETURN:
+                    self.stop_ai_thinking()
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:
-                    if self.menu_showed:
-                        self.chess.play_turn(event)
+                    if self.page == 'game':
+                        if self.ai_future is None:
+                            self.chess.play_turn(event)
                     else:
-                        pass
-
-    def menu(self):
+                        self.click_button(event.pos)
+
+    def click_button(self, pos: tuple[int, int]):
+        for rect, callback in self.buttons:
+            if rect.collidepoint(pos):
+                callback()
+                return
+
+    def show_page(self, page: str) -> bool:
+        """Switch to ``page``; False if it is already on screen and needs no redraw."""
+        if self.page == page:
+            return False
+        self.page = page
+        self.buttons = []
+        self.renderer.invalidate()
+        return True
+
+    def menu(self) -> list[pygame.Rect] | None:
+        if not self.show_page('menu'):
+            return []
         self.screen.fill((255, 255, 255))
         self.draw_text("Chess", 50, (0, 0, 0), self.screen.get_width() // 2, 150)
         self.draw_button("Play", 290, 300, 100, 50, self.start_game_handler)
+        return None
 
-    def display_game(self):
+    def display_game(self) -> list[pygame.Rect] | None:
+        """Draw the current page; returns the dirty rects of the board, or None if the whole screen changed."""
         if self.chess.winner:
+            if not self.show_page('winner'):
+                return []
             self.declare_winner(self.chess.winner)
         elif self.chess.pawn_promotion:
+            if not self.show_page('promotion'):
+                return []
             self.pawn_promotion()
-            self.chess.pawn_promotion = None
         else:
-            self.screen.fill((0, 0, 0))
-            self.screen.blit(self.board_img, (self.board_offset_x, self.board_offset_y))
-            self.chess.draw_turn_indicator()
-            self.chess.draw_pieces()
-            self.draw_board_markers()
+            self.show_page('game')
+            return self.renderer.draw()
+        return None
 
     def declare_winner(self, winner):
         self.screen.fill((255, 255, 255))
-        self.draw_text(f"{winner} wins!", 50, (0, 0, 0), self.screen.get_width() // 2, 150)
+        self.draw_text("Draw!" if winner == 'draw' else f"{winner} wins!", 50, (0, 0, 0), self.screen.get_width() // 2, 150)
         self.draw_button("Play Again", 250, 300, 140, 50, self.reset_game_handler)
 
     def reset_game_handler(self):
         self.menu_showed = False
+        self.cancel_ai_move()
         self.chess.reset()
 
     def draw_button(self, label, x, y, w, h, callback):
         rect = pygame.Rect(x, y, w, h)
         pygame.draw.rect(self.screen, (0, 0, 0), rect)
         self.draw_text(label, 20, (255, 255, 255), x + w // 2, y + h // 2)
-        if Utils().left_click_event() and rect.collidepoint(*Utils().get_mouse_event()):
-            pygame.draw.rect(self.screen, (255, 255, 255), rect, 3)
-            callback()
+        self.buttons.append((rect, callback))
 
     def draw_text(self, text, size, color, x, y):
-        font = pygame.font.SysFont("comicsansms", size)
-        label = font.render(text, True, color)
+        label = render_text(text, size, color)
         self.screen.blit(label, (x - label.get_width() // 2, y - label.get_height() // 2))
 
     def start_game_handler(self):
         self.menu_showed = True
 
     def pawn_promotion(self):
+        """Draw the promotion choices; clicks reach them through the main loop like any other page."""
         self.screen.fill((200, 200, 200))
         self.draw_text("Promote your pawn!", 30, (0, 0, 0), self.screen.get_width() // 2, 150)
 
         choices = ["queen", "rook", "bishop", "knight"]
-        buttons = [
-            (pygame.Rect(100 + idx * 120, 300, 100, 50), choice)
-            for idx, choice in enumerate(choices)
-        ]
-
-        for rect, choice in buttons:
-            pygame.draw.rect(self.screen, (0, 0, 0), rect)
-            self.draw_text(choice.capitalize(), 20, (255, 255, 255), rect.centerx, rect.centery)
-
-        pygame.display.flip()
-
-        while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    return
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    mouse_pos = pygame.mouse.get_pos()
-                    for rect, choice in buttons:
-                        if rect.collidepoint(mouse_pos):
-                            self.replace_pawn_with_piece(choice)
-                            return
-
+        for idx, choice in enumerate(choices):
+            self.draw_button(choice.capitalize(), 100 + idx * 120, 300, 100, 50,
+                             lambda choice=choice: self.replace_pawn_with_piece(choice))
 
     def replace_pawn_with_piece(self, piece_type):
-        pawn = self.chess.pawn_promotion
-        x, y = pawn.position
-        color = pawn.color
-        self.chess.board[x][y] = {
+        self.chess.promote_pawn({
             "queen": Queen,
             "rook": Rook,
             "bishop": Bishop,
             "knight": Knight
-        }[piece_type](color, [x, y])
-        self.chess.pawn_promotion = None
-        self.display_game()
-
-
-    def draw_board_markers(self):
-        square_size = self.board_img.get_rect().width // 8
-        font = pygame.font.SysFont("comicsansms", 20)
-        letters = "ABCDEFGH"
-        numbers = "87654321"
-        for col in range(8):
-            text = font.render(letters[col], True, (255, 255, 255))
-            x = self.board_offset_x + col * square_size + square_size // 2 - text.get_width() // 2
-            y_top = self.board_offset_y - text.get_height() - 5
-            self.screen.blit(text, (x, y_top))
-            y_bottom = self.board_offset_y + 8 * square_size + 5
-            self.screen.blit(text, (x, y_bottom))
-
-        for row in range(8):
-            text = font.render(numbers[row], True, (255, 255, 255))
-            y = self.board_offset_y + row * square_size + square_size // 2 - text.get_height() // 2
-            x_left = self.board_offset_x - text.get_width() - 5
-            self.screen.blit(text, (x_left, y))
-            x_right = self.board_offset_x + 8 * square_size + 5
-            self.screen.blit(text, (x_right, y))
+        }[piece_type])
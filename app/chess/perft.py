@@ -0,0 +1,178 @@
+import argparse
+import time
+
+from app.chess.bitboard import Bitboard, move_to_uci, new_move_buffer
+
+START_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+# Reference positions and their known node counts per depth (chessprogramming.org "Perft Results").
+POSITIONS = {
+    'start': (START_FEN, (20, 400, 8902, 197281, 4865609)),
+    'kiwipete': ('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+                 (48, 2039, 97862, 4085603)),
+    'position3': ('8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1', (14, 191, 2812, 43238, 674624)),
+    'position4': ('r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1', (6, 264, 9467, 422333)),
+    'position5': ('rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8', (44, 1486, 62379, 2103487)),
+    'position6': ('r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+                  (46, 2079, 89890, 3894594)),
+}
+
+
+class Perft:
+    """Counts leaf nodes of the legal move tree with one move buffer per ply.
+
+    The last ply is bulk-counted: the number of generated moves is the number of
+    leaves, so those positions are never played.
+    """
+
+    def __init__(self, bitboard: Bitboard):
+        self.bitboard = bitboard
+        self.buffers = []
+
+    def buffer(self, ply: int):
+        while len(self.buffers) <= ply:
+            self.buffers.append(new_move_buffer())
+        return self.buffers[ply]
+
+    def count(self, depth: int, ply: int = 0) -> int:
+        if depth == 0:
+            return 1
+        board = self.bitboard
+        moves = self.buffer(ply)
+        count = board.generate_moves(moves)
+        if depth == 1:
+            return count
+        nodes = 0
+        for index in range(count):
+            board.make_move(moves[index])
+            nodes += self.count(depth - 1, ply + 1)
+            board.unmake_move()
+        return nodes
+
+    def divide(self, depth: int) -> dict[str, int]:
+        """Leaf count below each root move, keyed by UCI."""
+        board = self.bitboard
+        moves = self.buffer(0)
+        result = {}
+        for index in range(board.generate_moves(moves)):
+            move = moves[index]
+            board.make_move(move)
+            result[move_to_uci(move)] = self.count(depth - 1, 1)
+            board.unmake_move()
+        return result
+
+
+def perft(fen: str, depth: int) -> int:
+    return Perft(Bitboard.from_fen(fen)).count(depth)
+
+
+def oracle_divide(fen: str, depth: int) -> dict[str, int]:
+    """``divide`` computed by python-chess, for cross-checking."""
+    import chess
+
+    board = chess.Board(fen)
+    result = {}
+    for move in board.legal_moves:
+        board.push(move)
+        result[move.uci()] = _oracle_count(board, depth - 1)
+        board.pop()
+    return result
+
+
+def _oracle_count(board, depth: int) -> int:
+    if depth <= 1:
+        return board.legal_moves.count() if depth == 1 else 1
+    nodes = 0
+    for move in board.legal_moves:
+        board.push(move)
+        nodes += _oracle_count(board, depth - 1)
+        board.pop()
+    return nodes
+
+
+def run_suite(max_depth: int, names: list[str] | None = None) -> bool:
+    """Perft every reference position up to ``max_depth`` and print nodes, time and nodes/sec."""
+    ok = True
+    for name in names or POSITIONS:
+        fen, expected = POSITIONS[name]
+        counter = Perft(Bitboard.from_fen(fen))
+        for depth in range(1, min(max_depth, len(expected)) + 1):
+            start = time.perf_counter()
+            nodes = counter.count(depth)
+            elapsed = time.perf_counter() - start
+            status = 'ok' if nodes == expected[depth - 1] else f'FAIL (expected {expected[depth - 1]})'
+            ok &= nodes == expected[depth - 1]
+            print(f"{name:<10} depth={depth} nodes={nodes:<9} time={elapsed:7.3f}s "
+                  f"nps={int(nodes / elapsed) if elapsed else 0:<9} {status}")
+    return ok
+
+
+def compare_with_oracle(fen: str, depth: int) -> bool:
+    """Print the root moves whose subtree counts differ from python-chess."""
+    ours, theirs = Perft(Bitboard.from_fen(fen)).divide(depth), oracle_divide(fen, depth)
+    mismatches = sorted(set(ours) | set(theirs))
+    mismatches = [move for move in mismatches if ours.get(move) != theirs.get(move)]
+    for move in mismatches:
+        print(f"{move}: ours={ours.get(move)} python-chess={theirs.get(move)}")
+    print(f"{'match' if not mismatches else 'MISMATCH'}: {sum(ours.values())} nodes "
+          f"vs {sum(theirs.values())} from python-chess")
+    return not mismatches
+
+
+def benchmark(repeat: int = 200):
+    """Latency of move generation, ``board_to_matrix`` and ``predict_move`` on the reference positions.
+
+    A quick look only; ``tests/test_benchmarks.py`` tracks the same operations
+    against a saved pytest-benchmark baseline.
+    """
+    from app.ai.prediction import inference_cache, predict_move
+    from app.ai.utils import board_to_matrix
+    from app.chess.engine import ChessEngine
+
+    engine = ChessEngine()
+    buffer = new_move_buffer()
+    for name, (fen, _) in POSITIONS.items():
+        engine.bitboard = Bitboard.from_fen(fen)
+        timings = {}
+        for label, call in (('generate_moves', lambda: engine.bitboard.generate_moves(buffer)),
+                            ('board_to_matrix', lambda: board_to_matrix(engine)),
+                            ('predict_move', lambda: (inference_cache.clear(), predict_move(engine)))):
+            call()
+            start = time.perf_counter()
+            for _ in range(repeat):
+                call()
+            timings[label] = (time.perf_counter() - start) / repeat * 1e6
+        print(f"{name:<10} " + ' '.join(f"{label}={micros:.1f}us" for label, micros in timings.items()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Perft node counts and move generator benchmarks.")
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--position', choices=sorted(POSITIONS), action='append',
+                        help="reference position(s) to run; all by default")
+    parser.add_argument('--fen', help="perft an arbitrary position instead of the reference suite")
+    parser.add_argument('--divide', action='store_true', help="print the node count below each root move")
+    parser.add_argument('--oracle', action='store_true', help="cross-check divide output against python-chess")
+    parser.add_argument('--bench', action='store_true',
+                        help="time generate_moves, board_to_matrix and predict_move instead")
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark()
+    elif args.fen or args.divide or args.oracle:
+        fens = [args.fen] if args.fen else [POSITIONS[name][0] for name in args.position or ['start']]
+        passed = True
+        for fen in fens:
+            if args.oracle:
+                passed &= compare_with_oracle(fen, args.depth)
+            else:
+                start = time.perf_counter()
+                divide = Perft(Bitboard.from_fen(fen)).divide(args.depth)
+                elapsed = time.perf_counter() - start
+                for move, nodes in sorted(divide.items()):
+                    print(f"{move}: {nodes}")
+                total = sum(divide.values())
+                print(f"nodes={total} time={elapsed:.3f}s nps={int(total / elapsed) if elapsed else 0}")
+        raise SystemExit(0 if passed else 1)
+    else:
+        raise SystemExit(0 if run_suite(args.depth, args.position) else 1)
@@ -1,70 +1,64 @@
 class ChessPiece:
+    __slots__ = ('color', 'position', 'has_moved')
+    piece_type = None
+
     def __init__(self, color, position):
         self.color = color  # 'white' or 'black'
-        self.position = position  # [x, y]
+        self.position = tuple(position)  # (x, y)
         self.has_moved = False
-        self.piece_type = None
 
     def possible_moves(self, board, is_attacking=False):
         raise NotImplementedError("This method should be overridden in subclasses")
 
     def move(self, destination):
-        self.position = destination
+        self.position = tuple(destination)
         self.has_moved = True
 
     def __str__(self):
         return self.__class__.__name__
 
 class King(ChessPiece):
-
-    def __init__(self, color, position):
-        super().__init__(color, position)
-        self.piece_type = 5
+    __slots__ = ()
+    piece_type = 5
 
     def possible_moves(self, board, is_attacking=False):
         x, y = self.position
         moves = [
-            [x, y - 1], [x, y + 1],
-            [x - 1, y], [x + 1, y],
-            [x - 1, y - 1], [x - 1, y + 1],
-            [x + 1, y - 1], [x + 1, y + 1]
+            (x, y - 1), (x, y + 1),
+            (x - 1, y), (x + 1, y),
+            (x - 1, y - 1), (x - 1, y + 1),
+            (x + 1, y - 1), (x + 1, y + 1)
         ]
 
         if not is_attacking:
             if not self.has_moved and not board.is_position_attacked(self.position, self.color):
                 if board.can_castle(self.color, 'king'):
-                    moves.append([x + 2, y])
+                    moves.append((x + 2, y))
                 if board.can_castle(self.color, 'queen'):
-                    moves.append([x - 2, y])
+                    moves.append((x - 2, y))
 
         return board.filter_valid_moves(self, moves)
 
 
 class Queen(ChessPiece):
-
-    def __init__(self, color, position):
-        super().__init__(color, position)
-        self.piece_type = 4
+    __slots__ = ()
+    piece_type = 4
 
     def possible_moves(self, board, is_attacking=False):
         return board.get_straight_moves(self) + board.get_diagonal_moves(self)
 
 
 class Rook(ChessPiece):
-
-    def __init__(self, color, position):
-        super().__init__(color, position)
-        self.piece_type = 3
+    __slots__ = ()
+    piece_type = 3
 
     def possible_moves(self, board, is_attacking=False):
         return board.get_straight_moves(self)
 
 
 class Bishop(ChessPiece):
-
-    def __init__(self, color, position):
-        super().__init__(color, position)
-        self.piece_type = 2
+    __slots__ = ()
+    piece_type = 2
 
     def possible_moves(self, board, is_attacking=False):
         return board.get_diagonal_moves(self)
@@ -72,27 +66,23 @@ class Bishop(ChessPiece):
 
 
 class Knight(ChessPiece):
-
-    def __init__(self, color, position):
-        super().__init__(color, position)
-        self.piece_type = 1
+    __slots__ = ()
+    piece_type = 1
 
     def possible_moves(self, board, is_attacking=False):
         x, y = self.position
         moves = [
-            [x - 2, y - 1], [x - 2, y + 1],
-            [x + 2, y - 1], [x + 2, y + 1],
-            [x - 1, y - 2], [x - 1, y + 2],
-            [x + 1, y - 2], [x + 1, y + 2]
+            (x - 2, y - 1), (x - 2, y + 1),
+            (x + 2, y - 1), (x + 2, y + 1),
+            (x - 1, y - 2), (x - 1, y + 2),
+            (x + 1, y - 2), (x + 1, y + 2)
         ]
         return board.filter_valid_moves(self, moves)
 
 
 class Pawn(ChessPiece):
-
-    def __init__(self, color, position):
-        super().__init__(color, position)
-        self.piece_type = 0
+    __slots__ = ()
+    piece_type = 0
 
     def possible_moves(self, board, is_attacking=False):
         x, y = self.position
@@ -101,13 +91,16 @@ class Pawn(ChessPiece):
         start_row = 1 if self.color == 'black' else 6
 
         if board.is_empty(x, y + direction):
-            moves.append([x, y + direction])
+            moves.append((x, y + direction))
             if y == start_row and board.is_empty(x, y + 2 * direction):
-                moves.append([x, y + 2 * direction])
+                moves.append((x, y + 2 * direction))
 
         for dx in [-1, 1]:
             nx, ny = x + dx, y + direction
             if board.is_enemy_piece(self.color, nx, ny):
-                moves.append([nx, ny])
+                moves.append((nx, ny))
 
         return board.filter_valid_moves(self, moves)
+
+
+PIECE_CLASSES = [Pawn, Knight, Bishop, Rook, Queen, King]
@@ -0,0 +1,115 @@
+from functools import lru_cache
+
+import pygame
+
+FONT_NAME = "comicsansms"
+TEXT_COLOR = (255, 255, 255)
+HIGHLIGHT_COLORS = {
+    "black": (0, 194, 39, 170),
+    "white": (28, 21, 212, 170)
+}
+
+
+@lru_cache(maxsize=None)
+def get_font(size: int) -> pygame.font.Font:
+    return pygame.font.SysFont(FONT_NAME, size)
+
+
+@lru_cache(maxsize=256)
+def render_text(text: str, size: int, color: tuple) -> pygame.Surface:
+    return get_font(size).render(text, True, color)
+
+
+class BoardRenderer:
+    """Draws the game screen of a ``Chess`` client incrementally.
+
+    The background (fill, board image and coordinate markers) is composed once.
+    Each ``draw`` compares what every square should show (piece and move
+    highlight) with what was drawn last time and repaints only the squares and
+    the turn label that changed, returning their rects for
+    ``pygame.display.update``. ``invalidate`` forces a full repaint after another
+    screen (menu, promotion, winner) has been shown.
+    """
+
+    def __init__(self, screen: pygame.Surface, chess, board_img: pygame.Surface, board_offset: tuple[int, int]):
+        self.screen = screen
+        self.chess = chess
+        self.square_length = chess.square_length
+        self.background = self.compose_background(board_img, board_offset)
+        self.highlights = {}
+        for color, rgba in HIGHLIGHT_COLORS.items():
+            surface = pygame.Surface((self.square_length, self.square_length), pygame.SRCALPHA)
+            surface.fill(rgba)
+            self.highlights[color] = surface
+        self.drawn = [[(None, None)] * 8 for _ in range(8)]
+        self.turn_rect = None
+        self.turn = None
+        self.valid = False
+
+    def compose_background(self, board_img: pygame.Surface, board_offset: tuple[int, int]) -> pygame.Surface:
+        background = pygame.Surface(self.screen.get_size()).convert()
+        background.fill((0, 0, 0))
+        offset_x, offset_y = board_offset
+        background.blit(board_img, board_offset)
+        square_size = self.square_length
+        for col, letter in enumerate("ABCDEFGH"):
+            text = render_text(letter, 20, TEXT_COLOR)
+            x = offset_x + col * square_size + square_size // 2 - text.get_width() // 2
+            background.blit(text, (x, offset_y - text.get_height() - 5))
+            background.blit(text, (x, offset_y + 8 * square_size + 5))
+        for row, number in enumerate("87654321"):
+            text = render_text(number, 20, TEXT_COLOR)
+            y = offset_y + row * square_size + square_size // 2 - text.get_height() // 2
+            background.blit(text, (offset_x - text.get_width() - 5, y))
+            background.blit(text, (offset_x + 8 * square_size + 5, y))
+        return background
+
+    def invalidate(self):
+        self.valid = False
+
+    def draw(self) -> list[pygame.Rect]:
+        dirty = []
+        if not self.valid:
+            self.screen.blit(self.background, (0, 0))
+            self.drawn = [[(None, None)] * 8 for _ in range(8)]
+            self.turn = None
+            self.turn_rect = None
+            self.valid = True
+            dirty.append(self.screen.get_rect())
+
+        chess = self.chess
+        selected = chess.selected_piece
+        targets = set(chess.moves) if selected else ()
+        for x in range(8):
+            for y in range(8):
+                piece = chess.get_piece_at(x, y)
+                state = ((piece.color, type(piece)) if piece else None,
+                         selected.color if (x, y) in targets else None)
+                if state != self.drawn[x][y]:
+                    self.drawn[x][y] = state
+                    dirty.append(self.draw_square(x, y, piece, state[1]))
+
+        if chess.turn != self.turn:
+            self.turn = chess.turn
+            dirty.append(self.draw_turn_indicator())
+        return dirty
+
+    def draw_square(self, x: int, y: int, piece, highlight: str | None) -> pygame.Rect:
+        coords = self.chess.square_coords[x][y]
+        rect = pygame.Rect(coords[0], coords[1], self.square_length, self.square_length)
+        self.screen.blit(self.background, rect, rect)
+        if highlight:
+            self.screen.blit(self.highlights[highlight], rect)
+        if piece:
+            self.chess.piece_sprites.draw(self.screen, piece, coords)
+        return rect
+
+    def draw_turn_indicator(self) -> pygame.Rect:
+        label = render_text(f"Turn: {self.turn.capitalize()}", 20, TEXT_COLOR)
+        rect = label.get_rect(midtop=(self.screen.get_width() // 2, 10))
+        dirty = rect.union(self.turn_rect) if self.turn_rect else rect
+        if self.turn_rect:
+            self.screen.blit(self.background, self.turn_rect, self.turn_rect)
+        self.screen.blit(label, rect)
+        self.turn_rect = rect
+        return dirty
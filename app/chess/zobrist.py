@@ -0,0 +1,9 @@
+import random
+
+# Fixed seed so keys (and anything persisted with them, like opening books) are stable across runs.
+_random = random.Random(0x5A0B21)
+
+PIECE_KEYS = [[_random.getrandbits(64) for _ in range(64)] for _ in range(12)]
+TURN_KEY = _random.getrandbits(64)
+CASTLING_KEYS = [_random.getrandbits(64) for _ in range(16)]
+EP_FILE_KEYS = [_random.getrandbits(64) for _ in range(8)]
@@ -1,33 +1,86 @@
 import os
 import pathlib
 import pickle
-from functools import lru_cache
+import subprocess
+import sys
+import time
+from functools import cached_property, lru_cache
 
-import torch
 from dotenv import load_dotenv
 
-from app.core.model import ChessModel
-
 load_dotenv()
 
 
 class BaseConfig:
     BASE_DIR: pathlib.Path = pathlib.Path(__file__).parent.parent.parent
     MODELS_DIR: pathlib.Path = BASE_DIR / 'app' / 'ai' / 'models'
+    TRANSPOSITION_TABLE_MB: int = int(os.getenv('TRANSPOSITION_TABLE_MB', 64))
+    INFERENCE_CACHE_SIZE: int = int(os.getenv('INFERENCE_CACHE_SIZE', 4096))
+    BATCH_MAX_SIZE: int = int(os.getenv('BATCH_MAX_SIZE', 64))
+    BATCH_MAX_WAIT_MS: float = float(os.getenv('BATCH_MAX_WAIT_MS', 5))
+    # 'policy' plays the network's top move, 'search' runs alpha-beta ordered by the policy
+    AI_MODE: str = os.getenv('AI_MODE', 'policy')
+    SEARCH_TIME_MS: int = int(os.getenv('SEARCH_TIME_MS', 1000))
+    SEARCH_MAX_NODES: int = int(os.getenv('SEARCH_MAX_NODES', 0))
+    SEARCH_MAX_DEPTH: int = int(os.getenv('SEARCH_MAX_DEPTH', 64))
+    SEARCH_POLICY_PLIES: int = int(os.getenv('SEARCH_POLICY_PLIES', 2))
+    # Worker processes for AI_MODE='search'; more than one runs Lazy SMP over a shared table
+    SEARCH_WORKERS: int = int(os.getenv('SEARCH_WORKERS', 1))
+
+    MODEL_PATH: pathlib.Path = MODELS_DIR / os.getenv('MODEL_FILE', 'TORCH_100EPOCHS.pth')
+    # 'eager', 'torchscript', 'compile' or 'int8' (see app.core.model.build_inference_model)
+    INFERENCE_BACKEND: str = os.getenv('INFERENCE_BACKEND', 'eager')
+    # Class index -> UCI as a NumPy array; the pickled move_to_int is the fallback
+    VOCABULARY_PATH: pathlib.Path = MODELS_DIR / 'move_vocabulary.npy'
+    # Built with `python -m app.ai.book build`; OPENING_BOOK= (empty) turns the book off
+    OPENING_BOOK_PATH: str = os.getenv('OPENING_BOOK', str(MODELS_DIR / 'book.bin'))
 
-    def __init__(self):
+    # The vocabulary, torch and the weights are loaded on first use, so importing the
+    # settings (and the rules engine with them) stays cheap.
+    @cached_property
+    def VOCABULARY(self):
+        import numpy as np
+
+        if self.VOCABULARY_PATH.exists():
+            return np.load(self.VOCABULARY_PATH, mmap_mode='r')
         with open(self.MODELS_DIR / 'move_to_int', "rb") as file:
             move_to_int = pickle.load(file)
+        vocabulary = np.empty(len(move_to_int), dtype='<U5')
+        for uci, index in move_to_int.items():
+            vocabulary[index] = str(uci)
+        return vocabulary
+
+    @cached_property
+    def MOVE_TO_INT(self) -> dict[int, str]:
+        return {index: str(uci) for index, uci in enumerate(self.VOCABULARY)}
+
+    @cached_property
+    def DEVICE(self):
+        import torch
+
+        return torch.device("cpu")
+
+    @cached_property
+    def OPENING_BOOK(self):
+        from app.ai.book import OpeningBook
+
+        if not self.OPENING_BOOK_PATH or not os.path.exists(self.OPENING_BOOK_PATH):
+            return None
+        return OpeningBook(self.OPENING_BOOK_PATH)
 
-        device = torch.device("cpu")
-        model = ChessModel(num_classes=len(move_to_int))
-        model.load_state_dict(torch.load(self.MODELS_DIR / "TORCH_100EPOCHS.pth", map_location="cpu"))
-        model.to(device)
-        model.eval()
-        move_to_int = {v: k for k, v in move_to_int.items()}
-        self.MODEL = model
-        self.MOVE_TO_INT = move_to_int
-        self.DEVICE = device
+    @cached_property
+    def MODEL(self):
+        from app.core.model import build_inference_model
+
+        return build_inference_model(self.FP32_MODEL, self.INFERENCE_BACKEND)
+
+    @cached_property
+    def FP32_MODEL(self):
+        from app.core.model import load_checkpoint
+
+        model = load_checkpoint(self.MODEL_PATH, len(self.VOCABULARY))
+        model.to(self.DEVICE)
+        return model
 
 class DevelopmentConfig(BaseConfig):
     pass
@@ -49,3 +102,21 @@ def get_settings() -> DevelopmentConfig | ProductionConfig:
 
 
 settings = get_settings()
+
+
+def _timed(code: str) -> float:
+    """Wall time of ``code`` in a fresh interpreter, so nothing is already imported or cached."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], check=True, cwd=BaseConfig.BASE_DIR)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    baseline = _timed('pass')
+    for label, code in (
+            ('interpreter', 'pass'),
+            ('rules engine', 'from app.chess.engine import ChessEngine; ChessEngine().legal_moves()'),
+            ('first prediction', 'from app.chess.engine import ChessEngine; from app.ai.prediction import '
+                                 'predict_move; predict_move(ChessEngine())')):
+        elapsed = _timed(code)
+        print(f"{label:<17} {elapsed * 1000:8.1f} ms ({(elapsed - baseline) * 1000:+.1f} ms over a bare interpreter)")
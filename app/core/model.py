@@ -24,4 +24,44 @@ class ChessModel(nn.Module):
         x = self.flatten(x)
         x = self.relu(self.fc1(x))
         x = self.fc2(x)
-        return x
\ No newline at end of file
+        return x
+
+INFERENCE_BACKENDS = ('eager', 'torchscript', 'compile', 'int8')
+
+
+def load_checkpoint(path, num_classes: int) -> ChessModel:
+    """An eval-mode ``ChessModel`` on the CPU with the ``state_dict`` saved at ``path``."""
+    import torch
+
+    model = ChessModel(num_classes=num_classes)
+    try:
+        # Zip-format checkpoints are mapped instead of read into memory.
+        state_dict = torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+    except RuntimeError:
+        state_dict = torch.load(path, map_location="cpu")
+    model.load_state_dict(state_dict)
+    model.eval()
+    return model
+
+
+def build_inference_model(model: ChessModel, backend: str = 'eager') -> nn.Module:
+    """Wrap an eval-mode ``ChessModel`` for the chosen inference backend.
+
+    ``torchscript`` scripts and freezes the weights into the graph, ``compile``
+    uses ``torch.compile`` (needs a C++ toolchain, compiles on the first call),
+    and ``int8`` applies dynamic int8 quantization to ``fc1`` and ``fc2``, which
+    hold almost all of the weights. ``eager`` returns the model unchanged.
+    """
+    import torch
+
+    model.eval()
+    if backend == 'eager':
+        return model
+    if backend == 'torchscript':
+        with torch.no_grad():
+            return torch.jit.optimize_for_inference(torch.jit.freeze(torch.jit.script(model)))
+    if backend == 'compile':
+        return torch.compile(model, dynamic=True)
+    if backend == 'int8':
+        return torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+    raise ValueError(f"unknown inference backend {backend!r}, expected one of {INFERENCE_BACKENDS}")
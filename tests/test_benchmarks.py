@@ -0,0 +1,50 @@
+"""Latency of the hot paths, tracked with pytest-benchmark.
+
+Save a baseline with ``pytest tests/test_benchmarks.py --benchmark-autosave`` and
+compare later runs against it with ``--benchmark-compare
+--benchmark-compare-fail=mean:10%``; ``--benchmark-skip`` runs only the
+correctness tests.
+"""
+import pytest
+
+from app.chess.bitboard import new_move_buffer
+from app.chess.engine import ChessEngine
+from app.chess.perft import POSITIONS
+from app.core.config import settings
+
+pytest.importorskip('pytest_benchmark')
+
+BENCH_POSITIONS = ['start', 'kiwipete', 'position6']
+
+
+@pytest.fixture(params=BENCH_POSITIONS)
+def position(request) -> str:
+    return request.param
+
+
+@pytest.fixture
+def engine(position) -> ChessEngine:
+    return ChessEngine.from_fen(POSITIONS[position][0])
+
+
+def test_generate_moves(benchmark, position, engine):
+    buffer = new_move_buffer()
+    count = benchmark(engine.bitboard.generate_moves, buffer)
+    assert count == POSITIONS[position][1][0]
+
+
+def test_board_to_matrix(benchmark, engine):
+    from app.ai.utils import board_to_matrix
+
+    planes = benchmark(board_to_matrix, engine)
+    assert planes.shape == (13, 8, 8)
+
+
+@pytest.mark.skipif(not settings.MODEL_PATH.exists(), reason="model weights are not available")
+def test_predict_move(benchmark, engine):
+    from app.ai.prediction import inference_cache, predict_move
+
+    # Clear the LRU cache before every round so the forward pass is what gets timed.
+    move = benchmark.pedantic(predict_move, args=(engine,), setup=inference_cache.clear, rounds=50,
+                              warmup_rounds=1)
+    assert engine.bitboard.parse_uci(move) is not None
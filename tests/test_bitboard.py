@@ -0,0 +1,32 @@
+import pytest
+
+from app.chess.bitboard import Bitboard, new_move_buffer
+from app.chess.perft import POSITIONS
+
+
+def snapshot(board: Bitboard) -> tuple:
+    return (board.key, board.fen(), list(board.attacks), list(board.attacked), [list(p) for p in board.pieces],
+            list(board.squares), len(board.history))
+
+
+def walk(board: Bitboard, depth: int, buffers: list) -> int:
+    """Make and unmake every move of the tree, checking the position is restored exactly each time."""
+    moves = buffers[depth]
+    before = snapshot(board)
+    assert board.key == board.compute_key()
+    checked = 0
+    for index in range(board.generate_moves(moves)):
+        board.make_move(moves[index])
+        assert board.key == board.compute_key()
+        if depth > 1:
+            checked += walk(board, depth - 1, buffers)
+        board.unmake_move()
+        assert snapshot(board) == before
+        checked += 1
+    return checked
+
+
+@pytest.mark.parametrize('name', sorted(POSITIONS))
+def test_unmake_restores_key_fen_and_attacks(name):
+    board = Bitboard.from_fen(POSITIONS[name][0])
+    assert walk(board, 2, [new_move_buffer() for _ in range(3)]) > 0
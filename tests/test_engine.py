@@ -0,0 +1,35 @@
+import pytest
+
+from app.chess.engine import ChessEngine
+from app.chess.perft import POSITIONS
+
+
+def snapshot(engine: ChessEngine) -> tuple:
+    grid = [(x, y, type(piece).__name__, piece.color, piece.position, piece.has_moved)
+            for x, column in enumerate(engine.board) for y, piece in enumerate(column) if piece is not None]
+    return engine.fen(), engine.key, engine.halfmove_clock, engine.fullmove_number, grid
+
+
+@pytest.mark.parametrize('name', sorted(POSITIONS))
+def test_unmake_restores_board_grid_and_clocks(name):
+    engine = ChessEngine.from_fen(POSITIONS[name][0])
+    before = snapshot(engine)
+    for move in engine.legal_moves():
+        engine.make_move(move)
+        after = snapshot(engine)
+        for reply in engine.legal_moves():
+            engine.make_move(reply)
+            assert engine.unmake_move() == reply
+            assert snapshot(engine) == after
+        assert engine.unmake_move() == move
+        assert snapshot(engine) == before
+
+
+def test_make_move_updates_clocks():
+    engine = ChessEngine()
+    engine.make_move(engine.bitboard.parse_uci('g1f3'))
+    assert (engine.halfmove_clock, engine.fullmove_number) == (1, 1)
+    engine.make_move(engine.bitboard.parse_uci('e7e5'))
+    assert (engine.halfmove_clock, engine.fullmove_number) == (0, 2)
+    engine.make_move(engine.bitboard.parse_uci('f3e5'))
+    assert engine.halfmove_clock == 0
@@ -0,0 +1,56 @@
+import pytest
+
+from app.chess.bitboard import CASTLE, Bitboard, move_to_uci
+from app.chess.engine import ChessEngine
+from app.chess.perft import POSITIONS, Perft
+
+
+@pytest.mark.parametrize('name', sorted(POSITIONS))
+def test_fen_round_trip(name):
+    fen = POSITIONS[name][0]
+    assert ChessEngine.from_fen(fen).fen() == fen
+    assert Bitboard.from_fen(fen).fen() == ' '.join(fen.split()[:4])
+
+
+def test_round_trip_after_moves():
+    engine = ChessEngine()
+    for uci in ('e2e4', 'g8f6', 'e4e5', 'd7d5'):
+        engine.make_move(engine.bitboard.parse_uci(uci))
+    fen = engine.fen()
+    assert fen == 'rnbqkb1r/ppp1pppp/5n2/3pP3/8/8/PPPP1PPP/RNBQKBNR w KQkq d6 0 3'
+    assert ChessEngine.from_fen(fen).fen() == fen
+
+
+@pytest.mark.parametrize('fen', [
+    '',
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP w KQkq - 0 1',
+    'rnbqkbnr/pppppppp/9/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNX w KQkq - 0 1',
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR x KQkq - 0 1',
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkx - 0 1',
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq z9 0 1',
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq e3 0 1',
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - x 1',
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - -1 1',
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 0',
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1 extra',
+])
+def test_invalid_fen_leaves_the_engine_untouched(fen):
+    engine = ChessEngine.from_fen(POSITIONS['kiwipete'][0])
+    before = engine.fen()
+    with pytest.raises(ValueError):
+        engine.load_fen(fen)
+    assert engine.fen() == before
+
+
+@pytest.mark.parametrize('fen, castling, castles', [
+    ('4k3/8/8/8/8/8/8/4K2R w KQ - 0 1', 'K', {'e1g1'}),
+    ('4k3/8/8/8/8/8/8/3K3R w KQ - 0 1', '-', set()),
+    ('r3k3/8/8/8/8/8/8/4K3 b kq - 0 1', 'q', {'e8c8'}),
+    ('r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1', 'KQkq', {'e1g1', 'e1c1'}),
+])
+def test_castling_rights_without_king_and_rook_are_dropped(fen, castling, castles):
+    bitboard = Bitboard.from_fen(fen)
+    assert bitboard.fen().split()[2] == castling
+    assert {move_to_uci(move) for move in bitboard.legal_moves() if move >> 12 == CASTLE} == castles
+    assert Perft(bitboard).count(3) > 0
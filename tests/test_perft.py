@@ -0,0 +1,18 @@
+import pytest
+
+from app.chess.bitboard import Bitboard
+from app.chess.perft import POSITIONS, Perft, oracle_divide
+
+
+@pytest.mark.parametrize('name', sorted(POSITIONS))
+@pytest.mark.parametrize('depth', [1, 2, 3])
+def test_perft_reference_counts(name, depth):
+    fen, expected = POSITIONS[name]
+    assert Perft(Bitboard.from_fen(fen)).count(depth) == expected[depth - 1]
+
+
+@pytest.mark.parametrize('name', ['kiwipete', 'position3', 'position4', 'position5'])
+def test_divide_matches_python_chess(name):
+    pytest.importorskip('chess')
+    fen = POSITIONS[name][0]
+    assert Perft(Bitboard.from_fen(fen)).divide(2) == oracle_divide(fen, 2)